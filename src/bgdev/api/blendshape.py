@@ -2,10 +2,15 @@
 
 :author: Benoit Gielly (benoit.gielly@gmail.com)
 """
+import itertools
+import numbers
+from collections import OrderedDict
+
+import numpy as np
 from maya import cmds
 from maya.api import OpenMaya
 
-from . import attribute, core, deformer, mesh
+from . import attribute, core, mesh
 
 
 def reconnect_blendshape(blendshape, geometry):
@@ -102,28 +107,28 @@ def reset_target_delta(blendshape, shape, targets=None):
 
 
 def add_blendshape_targets(blendshape, shape, alias=None):
-    """Add and update targets on the given blendShape."""
-    alias = alias or shape
+    """Add or update a target on the given blendShape from a shape.
 
-    # check that shape exists
-    if not core.obj_exists(shape):
-        raise RuntimeError("Shape to add doesn't exists: {}".format(shape))
+    This goes through :func:`add_targets`: the deltas of the shape are
+    written in the target without connecting it, and it can't be undone.
+    An existing target keeps its weight.
 
-    # get blendshape index
-    targets = attribute.get_node_aliases(blendshape, indices=True) or {}
-    plug = "{}.weight".format(blendshape)
-    index = targets.get(shape) or attribute.get_next_index(plug)
+    Args:
+        blendshape (str): Name of the blendshape node.
+        shape (str): Name of the mesh to add as a target.
+        alias (str): Name of the target. Use the short name of the shape
+            if None.
 
-    # add shape and update targets dict
-    geometry = deformer.get_output_geometry(blendshape)[0]
-    cmds.blendShape(blendshape, edit=True, target=(geometry, index, shape, 1))
-    disconnect_target(blendshape, shape)
+    Raises:
+        RuntimeError: If the shape doesn't exist.
 
-    plug = core.as_plug("{}.weight[{}]".format(blendshape, index))
-    if attribute.get_alias(plug) != alias:
-        attribute.set_alias(plug, alias)
-    if attribute.is_free(plug):
-        plug.setFloat(0.0)
+    Returns:
+        int: The index of the target.
+    """
+    if not core.obj_exists(shape):
+        raise RuntimeError("Shape to add doesn't exists: {}".format(shape))
+    targets = {alias: shape} if alias else [shape]
+    return list(add_targets(blendshape, targets).values())[0]
 
 
 def disconnect_target(blendshape, shape):
@@ -206,3 +211,256 @@ def restore_target_weights(restore_data):
     modifier.doIt()
     for info in restore_data.values():
         info["plug"].isLocked = info["locked"]
+
+
+def get_target_index(blendshape, target):
+    """Get the index of given target, from its alias or index."""
+    if isinstance(target, numbers.Integral):
+        return int(target)
+    targets = attribute.get_node_aliases(blendshape, indices=True) or {}
+    if target not in targets:
+        raise ValueError("{} isn't a target of {}".format(target, blendshape))
+    return targets[target]
+
+
+def get_target_item(blendshape, target, inbetween=6000, geometry=0):
+    """Get the inputTargetItem plug of given target.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        target (int or str): Index or alias of the target.
+        inbetween (int): The inbetween item, 6000 being the full target.
+        geometry (int): Index of the deformed geometry.
+
+    Returns:
+        OpenMaya.MPlug: The inputTargetItem element plug.
+    """
+    node = core.as_node(blendshape)
+    plug = node.findPlug("inputTargetItem", False)
+    plug.selectAncestorLogicalIndex(geometry, node.attribute("inputTarget"))
+    plug.selectAncestorLogicalIndex(
+        get_target_index(blendshape, target),
+        node.attribute("inputTargetGroup"),
+    )
+    plug.selectAncestorLogicalIndex(inbetween)
+    return plug
+
+
+def read_target_item(item):
+    """Read the sparse deltas stored on an inputTargetItem plug.
+
+    Args:
+        item (OpenMaya.MPlug): The inputTargetItem element plug.
+
+    Returns:
+        tuple: The ``(N,)`` int32 vertex indices and their ``(N x 3)``
+        float32 deltas. Both are empty if the target has no stored deltas,
+        like targets driven by a connected mesh.
+    """
+    node = OpenMaya.MFnDependencyNode(item.node())
+    indices = np.zeros(0, dtype=np.int32)
+    deltas = np.zeros((0, 3), dtype=np.float32)
+    try:
+        points = item.child(node.attribute("inputPointsTarget")).asMObject()
+        components = item.child(
+            node.attribute("inputComponentsTarget")
+        ).asMObject()
+    except RuntimeError:
+        return indices, deltas
+    if points.isNull() or components.isNull():
+        return indices, deltas
+
+    points = OpenMaya.MFnPointArrayData(points).array()
+    deltas = core.as_numpy_points(points, np.float32)
+    components = OpenMaya.MFnComponentListData(components)
+    elements = [
+        OpenMaya.MFnSingleIndexedComponent(components.get(i)).getElements()
+        for i in range(components.length())
+    ]
+    if elements:
+        indices = np.concatenate(
+            [np.fromiter(x, np.int32, count=len(x)) for x in elements]
+        )
+    return indices, deltas
+
+
+def get_target_deltas(blendshape, target, inbetween=6000, geometry=0):
+    """Get the deltas of given blendshape target.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        target (int or str): Index or alias of the target.
+        inbetween (int): The inbetween item, 6000 being the full target.
+        geometry (int): Index of the deformed geometry.
+
+    Returns:
+        tuple: The ``(N,)`` int32 vertex indices and their ``(N x 3)``
+        float32 deltas. See :func:`read_target_item`.
+    """
+    item = get_target_item(blendshape, target, inbetween, geometry)
+    return read_target_item(item)
+
+
+def set_target_deltas(  # pylint: disable=too-many-arguments
+    blendshape, target, indices, deltas, inbetween=6000, geometry=0
+):
+    """Set the deltas of given blendshape target.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        target (int or str): Index or alias of the target.
+        indices (numpy.ndarray): The ``(N,)`` vertex indices.
+        deltas (numpy.ndarray): The ``(N x 3)`` deltas of these vertices.
+        inbetween (int): The inbetween item, 6000 being the full target.
+        geometry (int): Index of the deformed geometry.
+    """
+    points_obj, components_obj = create_delta_data(indices, deltas)
+    item = get_target_item(blendshape, target, inbetween, geometry)
+    node = core.as_node(blendshape)
+    item.child(node.attribute("inputPointsTarget")).setMObject(points_obj)
+    item.child(node.attribute("inputComponentsTarget")).setMObject(
+        components_obj
+    )
+
+
+def create_delta_data(indices, deltas):
+    """Create the inputPointsTarget and inputComponentsTarget data.
+
+    Args:
+        indices (numpy.ndarray): The ``(N,)`` vertex indices.
+        deltas (numpy.ndarray): The ``(N x 3)`` deltas of these vertices.
+
+    Returns:
+        tuple: The point array and component list data MObjects.
+    """
+    deltas = np.asarray(deltas, dtype=np.float64).reshape(-1, 3)
+    points = core.as_point_array(deltas)
+    points_obj = OpenMaya.MFnPointArrayData().create(points)
+
+    component = OpenMaya.MFnSingleIndexedComponent()
+    component_obj = component.create(OpenMaya.MFn.kMeshVertComponent)
+    component.addElements(OpenMaya.MIntArray(np.asarray(indices).tolist()))
+    components_data = OpenMaya.MFnComponentListData()
+    components_obj = components_data.create()
+    components_data.add(component_obj)
+    return points_obj, components_obj
+
+
+def get_input_points(blendshape, geometry=0):
+    """Get the object space points entering the blendshape node.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        geometry (int): Index of the deformed geometry.
+
+    Returns:
+        numpy.ndarray: The ``(vertices x 3)`` points.
+    """
+    node = core.as_node(blendshape)
+    plug = node.findPlug("input", False).elementByLogicalIndex(geometry)
+    plug = plug.child(node.attribute("inputGeometry"))
+    points = OpenMaya.MFnMesh(plug.asMObject()).getPoints()
+    return core.as_numpy_points(points)
+
+
+def add_targets(blendshape, targets, geometry=0, tolerance=1e-6):
+    """Add several targets at once, without connecting any geometry.
+
+    The deltas are written straight into the target items, and every new
+    weight and alias is created by a single MDGModifier. MDGModifier.doIt
+    isn't undoable from Python, so this can't be undone. Targets whose
+    alias already exists are updated in place, new ones use indices free
+    in both the weights and the target groups.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        targets (list or dict): Names of meshes, aliased by their short
+            name, or a dict of aliases and their mesh name, ``(vertices x
+            3)`` deltas or ``(indices, deltas)`` pair of sparse deltas.
+        geometry (int): Index of the deformed geometry.
+        tolerance (float): Vertices moving less than this from the base
+            mesh are not stored.
+
+    Returns:
+        OrderedDict: The index of each target, by alias.
+    """
+    if not isinstance(targets, dict):
+        targets = OrderedDict(
+            (x.rpartition("|")[-1].rpartition(":")[-1], x) for x in targets
+        )
+
+    node = core.as_node(blendshape)
+    aliases = attribute.get_node_aliases(blendshape, indices=True) or {}
+    used = set(attribute.get_multi_indices(blendshape + ".weight"))
+    used.update(aliases.values())
+
+    # deleted targets can leave their group behind, without a weight
+    groups = node.findPlug("inputTarget", False)
+    groups = groups.elementByLogicalIndex(geometry)
+    groups = groups.child(node.attribute("inputTargetGroup"))
+    used.update(groups.getExistingArrayAttributeIndices())
+    free = (x for x in itertools.count() if x not in used)
+
+    base = None
+    result = OrderedDict()
+    modifier = OpenMaya.MDGModifier()
+    for alias, value in targets.items():
+        if isinstance(value, (tuple, list)) and len(value) == 2:
+            indices, deltas = value
+        else:
+            if not isinstance(value, np.ndarray):
+                if base is None:
+                    base = get_input_points(blendshape, geometry)
+                points = core.as_mesh(value).getPoints()
+                value = core.as_numpy_points(points) - base
+            indices = np.flatnonzero(np.abs(value).max(axis=1) > tolerance)
+            deltas = value[indices]
+
+        index = aliases.get(alias)
+        if index is None:
+            index = next(free)
+            weight = node.findPlug("weight", False)
+            modifier.newPlugValueFloat(weight.elementByLogicalIndex(index), 0)
+            modifier.commandToExecute(
+                "aliasAttr {} {}.weight[{}]".format(alias, blendshape, index)
+            )
+
+        item = get_target_item(blendshape, index, geometry=geometry)
+        points_obj, components_obj = create_delta_data(indices, deltas)
+        modifier.newPlugValue(
+            item.child(node.attribute("inputPointsTarget")), points_obj
+        )
+        modifier.newPlugValue(
+            item.child(node.attribute("inputComponentsTarget")),
+            components_obj,
+        )
+        result[alias] = index
+    modifier.doIt()
+    return result
+
+
+def get_all_target_deltas(blendshape, geometry=0):
+    """Get the deltas of every target and inbetween in one pass.
+
+    Args:
+        blendshape (str): Name of the blendshape node.
+        geometry (int): Index of the deformed geometry.
+
+    Returns:
+        OrderedDict: By target index, an OrderedDict of the
+        ``(indices, deltas)`` of each inbetween item (6000 being the full
+        target). See :func:`read_target_item`.
+    """
+    node = core.as_node(blendshape)
+    plug = node.findPlug("inputTarget", False).elementByLogicalIndex(geometry)
+    groups = plug.child(node.attribute("inputTargetGroup"))
+    result = OrderedDict()
+    for index in groups.getExistingArrayAttributeIndices():
+        items = groups.elementByLogicalIndex(index).child(
+            node.attribute("inputTargetItem")
+        )
+        result[index] = OrderedDict(
+            (x, read_target_item(items.elementByLogicalIndex(x)))
+            for x in items.getExistingArrayAttributeIndices()
+        )
+    return result
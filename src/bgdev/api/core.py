@@ -5,6 +5,9 @@ Note:
 
 :author: Benoit Gielly (benoit.gielly@gmail.com)
 """
+import itertools
+
+import numpy as np
 from maya.api import OpenMaya, OpenMayaAnim
 
 
@@ -59,3 +62,30 @@ def as_mesh(name):
 def as_filter(deformer):
     """Get deformer as GeometryFilter."""
     return OpenMayaAnim.MFnGeometryFilter(as_obj(deformer))
+
+
+def as_skincluster(skincluster):
+    """Get skincluster as MFnSkinCluster."""
+    return OpenMayaAnim.MFnSkinCluster(as_obj(skincluster))
+
+
+def as_point_array(points):
+    """Get a ``(N x 3)`` array or list of points as MPointArray.
+
+    The points are converted in a single call from nested lists, instead of
+    creating one MPoint per point in Python.
+    """
+    if hasattr(points, "tolist"):
+        points = points.tolist()
+    return OpenMaya.MPointArray(points)
+
+
+def as_numpy_points(points, dtype=np.float64):
+    """Get an MPointArray as a ``(N x 3)`` NumPy array.
+
+    The coordinates are streamed into a preallocated buffer, instead of
+    letting NumPy discover the shape of every MPoint before copying them.
+    """
+    values = itertools.chain.from_iterable(points)
+    array = np.fromiter(values, dtype=dtype, count=len(points) * 4)
+    return array.reshape(-1, 4)[:, :3]
@@ -0,0 +1,138 @@
+"""API methods for skinclusters.
+
+:author: Benoit Gielly (benoit.gielly@gmail.com)
+"""
+from maya.api import OpenMaya
+
+from . import core
+
+
+def get_geometry(skincluster):
+    """Get the MDagPath of the first geometry deformed by given skincluster."""
+    filter_ = core.as_skincluster(skincluster)
+    return OpenMaya.MDagPath.getAPathTo(filter_.getOutputGeometry()[0])
+
+
+def get_influences(skincluster):
+    """Get influences names in the skincluster's physical order."""
+    filter_ = core.as_skincluster(skincluster)
+    return [x.partialPathName() for x in filter_.influenceObjects()]
+
+
+def get_vertex_components(dag, vertices=None):
+    """Create a vertex component of given mesh.
+
+    Args:
+        dag (OpenMaya.MDagPath): The mesh to create the components for.
+        vertices (list): List of vertex indices. Use all vertices if None.
+
+    Returns:
+        OpenMaya.MObject: The vertex components.
+    """
+    component = OpenMaya.MFnSingleIndexedComponent()
+    obj = component.create(OpenMaya.MFn.kMeshVertComponent)
+    if vertices is None:
+        component.setCompleteData(OpenMaya.MFnMesh(dag).numVertices)
+    else:
+        component.addElements(OpenMaya.MIntArray(vertices))
+    return obj
+
+
+def get_weights(skincluster, vertices=None):
+    """Get all the weights of given skincluster in one call.
+
+    Args:
+        skincluster (str): Name of the skincluster node.
+        vertices (list): List of vertex indices. Use all vertices if None.
+
+    Returns:
+        tuple: The flat MDoubleArray weights and the influences count.
+    """
+    filter_ = core.as_skincluster(skincluster)
+    dag = get_geometry(skincluster)
+    components = get_vertex_components(dag, vertices)
+    return filter_.getWeights(dag, components)
+
+
+def set_weights(
+    skincluster, weights, influences, vertices=None, normalize=False
+):
+    """Set the weights of given skincluster in one call.
+
+    Args:
+        skincluster (str): Name of the skincluster node.
+        weights (list): Flat list of weights, ordered per vertex.
+        influences (list): Physical indices of the influences to set.
+        vertices (list): List of vertex indices. Use all vertices if None.
+        normalize (bool): Let Maya normalize the weights if True.
+    """
+    filter_ = core.as_skincluster(skincluster)
+    dag = get_geometry(skincluster)
+    components = get_vertex_components(dag, vertices)
+    filter_.setWeights(
+        dag,
+        components,
+        OpenMaya.MIntArray(influences),
+        OpenMaya.MDoubleArray(weights),
+        normalize,
+    )
+
+
+def remove_influences(skincluster, influences):
+    """Remove influences from given skincluster in a single modifier.
+
+    The matrix, bindPreMatrix, lockWeights and influenceColor plugs of the
+    influences are removed, breaking their connections, and their entries
+    are compacted out of the weight list. Their weights aren't redistributed
+    so they should already be zero.
+
+    MDGModifier.doIt isn't undoable from Python, so this can't be undone.
+    Use `cmds.skinCluster` with the removeInfluence flag in interactive
+    tools.
+
+    Args:
+        skincluster (str): Name of the skincluster node.
+        influences (list): Physical indices of the influences to remove.
+    """
+    filter_ = core.as_skincluster(skincluster)
+    dags = filter_.influenceObjects()
+    logicals = {filter_.indexForInfluenceObject(dags[x]) for x in influences}
+
+    modifier = OpenMaya.MDGModifier()
+    for name in ("matrix", "bindPreMatrix", "lockWeights", "influenceColor"):
+        if not filter_.hasAttribute(name):
+            continue
+        plug = filter_.findPlug(name, False)
+        for index in logicals & set(plug.getExistingArrayAttributeIndices()):
+            modifier.removeMultiInstance(
+                plug.elementByLogicalIndex(index), True
+            )
+
+    weight_list = filter_.findPlug("weightList", False)
+    for i in weight_list.getExistingArrayAttributeIndices():
+        weights = weight_list.elementByLogicalIndex(i).child(0)
+        existing = weights.getExistingArrayAttributeIndices()
+        for index in logicals.intersection(existing):
+            modifier.removeMultiInstance(
+                weights.elementByLogicalIndex(index), True
+            )
+    modifier.doIt()
+
+
+def get_bind_matrices(skincluster):
+    """Get the bindPreMatrix matching the current pose of each influence.
+
+    The inverse world matrix of every influence is read from its MDagPath,
+    keyed by the logical index of the influence.
+
+    Args:
+        skincluster (str): Name of the skincluster node.
+
+    Returns:
+        dict: The flat 16 values of each bindPreMatrix, by logical index.
+    """
+    filter_ = core.as_skincluster(skincluster)
+    return {
+        filter_.indexForInfluenceObject(x): list(x.inclusiveMatrixInverse())
+        for x in filter_.influenceObjects()
+    }
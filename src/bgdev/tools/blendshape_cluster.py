@@ -9,6 +9,8 @@ import logging
 from maya import cmds
 from maya.api import OpenMaya, OpenMayaAnim
 
+import bgdev.api.blendshape
+
 LOG = logging.getLogger(__name__)
 
 
@@ -36,32 +38,18 @@ def convert_target_to_cluster(blendshape, shape, deform, mode=None):
     orig_points = get_point_array(geometry)
     targets = get_node_aliases(blendshape, indices=True)
     index = targets.get(shape)
-    plugname = (
-        blendshape
-        + ".inputTarget[0].inputTargetGroup[{}].inputTargetItem[6000]"
-    )
 
-    # get deltas values
-    plug = plugname.format(index) + ".inputPointsTarget"
-    deltas = cmds.getAttr(plug) or []
-
-    # find vertices with deltas
-    components = []
-    plug = plugname.format(index) + ".inputComponentsTarget"
-    for each in cmds.getAttr(plug) or []:
-        parsed = each.rsplit("[")[-1].rsplit("]")[0]
-        if ":" not in parsed:
-            components.append(int(parsed))
-            continue
-        result = [int(x) for x in parsed.split(":")]
-        components.extend(range(result[0], result[-1] + 1))
+    # get the vertices with deltas and their values
+    components, deltas = bgdev.api.blendshape.get_target_deltas(
+        blendshape, index
+    )
 
     # build deltas info list
     delta_info = {}
     weightmap = [0.0] * len(orig_points)
-    for i, value in zip(components, deltas):
+    for i, value in zip(components.tolist(), deltas.tolist()):
         orig_pos = OpenMaya.MVector(orig_points[i])
-        delta_vec = OpenMaya.MVector(value[:-1])
+        delta_vec = OpenMaya.MVector(value)
         delta_pos = orig_pos + delta_vec
         delta_pnt = OpenMaya.MPoint(delta_pos)
         weight = orig_points[i].distanceTo(delta_pnt)
@@ -10,11 +10,16 @@ from __future__ import print_function
 
 import cProfile
 import datetime
+import json
 import logging
 import os
 import pstats
+import statistics
 import time
+import timeit
+from collections import OrderedDict
 from contextlib import ContextDecorator
+from csv import DictWriter
 
 LOG = logging.getLogger(__name__)
 
@@ -150,6 +155,138 @@ def frames_per_second(
     return rate
 
 
+def profile_deformer_stack(mesh, frames=10, iterations=3):
+    """Time each deformer in the history of given mesh.
+
+    For each deformer, the mesh is evaluated over the frames with the whole
+    stack, then with the deformer bypassed (nodeState set to "Has No
+    Effect"), once per iteration. The cost of a deformer is the median of
+    how much faster the mesh evaluates without it, and its standard
+    deviation tells how noisy the timings are. Costs below the noise can
+    be slightly negative.
+
+    Args:
+        mesh (str): Name of the deformed mesh.
+        frames (int or list): The frames to evaluate, or an amount of frames
+            starting from the playback start.
+        iterations (int): Amount of times the frames are evaluated.
+
+    Raises:
+        ValueError: If there are no frames or iterations to evaluate.
+
+    Returns:
+        list: One OrderedDict per deformer with its "rank", "deformer",
+        "type", median "ms" per frame, "ms_stdev" and "share" of the stack
+        time, slowest first. See :func:`export_profile`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from maya import cmds
+
+    if isinstance(frames, int):
+        if frames < 1:
+            raise ValueError("Can't profile {} frames.".format(frames))
+        start = cmds.playbackOptions(query=True, minTime=True)
+        frames = [start + x for x in range(frames)]
+    if not frames or iterations < 1:
+        raise ValueError("Nothing to profile, check the frames/iterations.")
+
+    shape = cmds.ls(mesh, dagObjects=True, shapes=True, noIntermediate=True)
+    plug = "{}.outMesh".format(shape[0] if shape else mesh)
+    history = cmds.listHistory(mesh, pruneDagObjects=True) or []
+    deformers = cmds.ls(history, type="geometryFilter")
+
+    def measure():
+        total = 0.0
+        for frame in frames:
+            cmds.currentTime(frame, update=False)
+            if deformers:
+                cmds.dgdirty(deformers)
+            start = timeit.default_timer()
+            cmds.dgeval(plug)
+            total += timeit.default_timer() - start
+        return total * 1000.0 / len(frames)
+
+    current = cmds.currentTime(query=True)
+    stacks, rows = [], []
+    try:
+        for deformer in deformers:
+            attr = deformer + ".nodeState"
+            if not cmds.getAttr(attr, settable=True):
+                LOG.warning("Can't bypass %r, skipping it.", deformer)
+                continue
+
+            # alternate both states so they drift the same way
+            state = cmds.getAttr(attr)
+            costs = []
+            try:
+                for _ in range(iterations):
+                    stacks.append(measure())
+                    cmds.setAttr(attr, 1)
+                    costs.append(stacks[-1] - measure())
+                    cmds.setAttr(attr, state)
+            finally:
+                cmds.setAttr(attr, state)
+            rows.append(
+                OrderedDict(
+                    [
+                        ("deformer", deformer),
+                        ("type", cmds.nodeType(deformer)),
+                        ("ms", statistics.median(costs)),
+                        ("ms_stdev", get_stdev(costs)),
+                    ]
+                )
+            )
+        if not stacks:
+            stacks = [measure() for _ in range(iterations)]
+    finally:
+        cmds.currentTime(current)
+
+    stack = statistics.median(stacks)
+    for row in rows:
+        row["share"] = row["ms"] / stack if stack else 0.0
+    rows.sort(key=lambda x: x["ms"], reverse=True)
+    table = [
+        OrderedDict([("rank", i)] + list(x.items()))
+        for i, x in enumerate(rows, 1)
+    ]
+    line = (
+        "\n    {rank:>2}. {deformer} ({type}): "
+        "{ms:.3f} +/- {ms_stdev:.3f} ms ({share:.0%})"
+    )
+    msg = "".join(line.format(**x) for x in table)
+    LOG.info("%r evaluates in %.3f ms/frame:%s", mesh, stack, msg)
+    return table
+
+
+def get_stdev(values):
+    """Get the sample standard deviation of values, 0.0 if there's one."""
+    return statistics.stdev(values) if len(values) > 1 else 0.0
+
+
+def export_profile(table, path):
+    """Save the table of :func:`profile_deformer_stack` to a file.
+
+    Args:
+        table (list): The rows of the profile.
+        path (str): Path of the file. Saved as CSV if it ends with ".csv",
+            as JSON otherwise.
+    """
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as stream:
+            fields = list(table[0]) if table else []
+            writer = DictWriter(stream, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(table)
+    else:
+        with open(path, "w") as stream:
+            json.dump(table, stream, indent=4)
+    LOG.info("Deformer profile saved into %s", path)
+
+
 class Profiler(ContextDecorator):
     """Create a python profiler to check for code usage.
 
@@ -6,7 +6,9 @@
 """
 import contextlib
 
-from bgdev.logger import LOG
+from maya import cmds
+
+from bgdev import LOG
 
 
 @contextlib.contextmanager
@@ -17,3 +19,14 @@ def execute_ctx(status):
         yield
     except Exception as exc:  # pylint:disable=broad-except
         LOG.error("Failed: %s", exc)
+
+
+@contextlib.contextmanager
+def undo_chunk(name=None):
+    """Group every command run in this context into a single undo chunk."""
+    flags = {"chunkName": name} if name else {}
+    cmds.undoInfo(openChunk=True, **flags)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
@@ -3,18 +3,26 @@
 :created: 28/05/2018
 :author: Benoit GIELLY <benoit.gielly@gmail.com>
 """
-from __future__ import absolute_import
+from __future__ import absolute_import, division
 
 import logging
 
 import maya.internal.common.utils.geometry
+import numpy as np
+import six
 from maya import cmds
 from maya.api import OpenMaya
 
+import bgdev.api.core
+import bgdev.api.skincluster
 import bgdev.utils.decorator
+import bgdev.utils.mesh
+import bgdev.utils.spatial
 
 LOG = logging.getLogger(__name__)
 
+FALLOFFS = ("linear", "smooth")
+
 
 def rename_blendshape_targets():
     """Rename blendshape targets to the currently connected mesh input."""
@@ -123,73 +131,440 @@ def cleanup_lattices_ffds():
             cmds.rename(set_, ffd + "Set")
 
 
+class DeformerWeights(object):
+    """Read and write a whole weight map of a deformer at once.
+
+    Each :meth:`get` is a single getAttr of the weight multi and each
+    :meth:`set` a single setAttr on the full index range, instead of one
+    command per vertex. SkinCluster columns go through MFnSkinCluster.
+
+    Args:
+        deformer (str): Name of the deformer node.
+        index (int or str): On blendShapes, the target index, or the base
+            weights if None. On skinClusters, the influence name or
+            physical index (its column in the weight array). Ignored on
+            the other deformers.
+        geometry (int): Index of the deformed geometry.
+
+    Raises:
+        ValueError: If the deformer type isn't supported.
+
+    """
+
+    WEIGHT_PLUGS = {
+        "blendShape": "{node}.inputTarget[{geometry}].baseWeights",
+        "blendShapeTarget": (
+            "{node}.inputTarget[{geometry}]"
+            ".inputTargetGroup[{index}].targetWeights"
+        ),
+        "nonLinear": "{node}.weightList[{geometry}].weights",
+        "cluster": "{node}.weightList[{geometry}].weights",
+        "ffd": "{node}.weightList[{geometry}].weights",
+        "proximityWrap": "{node}.weightList[{geometry}].weights",
+        "skinCluster": None,
+    }
+
+    def __init__(self, deformer, index=None, geometry=0):
+        self.deformer = deformer
+        self.geometry = geometry
+        self.node_type = self.get_type(deformer)
+        if not self.node_type:
+            raise ValueError(
+                "Unsupported deformer type: {}".format(cmds.nodeType(deformer))
+            )
+
+        self.index = index
+        if self.node_type == "skinCluster":
+            self.index = self.get_influence_index(index or 0)
+        elif self.node_type == "blendShape" and index is not None:
+            self.node_type = "blendShapeTarget"
+
+    def __repr__(self):
+        return "{}({!r}, index={!r})".format(
+            self.__class__.__name__, self.deformer, self.index
+        )
+
+    @classmethod
+    def get_type(cls, deformer):
+        """Get the key of given deformer in :attr:`WEIGHT_PLUGS`.
+
+        Deformers deriving from weightGeometryFilter use the cluster plug.
+
+        Returns:
+            str: The key, None if the deformer isn't supported.
+        """
+        node_type = cmds.nodeType(deformer)
+        if node_type in cls.WEIGHT_PLUGS:
+            return node_type
+        inherited = cmds.nodeType(deformer, inherited=True) or []
+        if "weightGeometryFilter" in inherited:
+            return "cluster"
+        return None
+
+    @property
+    def plug(self):
+        """str: Name of the weight multi attribute."""
+        template = self.WEIGHT_PLUGS[self.node_type]
+        if not template:
+            return None
+        return template.format(
+            node=self.deformer, geometry=self.geometry, index=self.index
+        )
+
+    @property
+    def dag(self):
+        """OpenMaya.MDagPath: The deformed geometry."""
+        filter_ = bgdev.api.core.as_filter(self.deformer)
+        return filter_.getPathAtIndex(self.geometry)
+
+    @property
+    def count(self):
+        """int: Amount of components of the deformed geometry."""
+        return OpenMaya.MItGeometry(self.dag).count()
+
+    def get_influence_index(self, influence):
+        """Get the physical index of given skinCluster influence."""
+        if not isinstance(influence, six.string_types):
+            return int(influence)
+        influences = bgdev.api.skincluster.get_influences(self.deformer)
+        names = [x.rpartition("|")[-1] for x in influences]
+        for names_ in (influences, names):
+            if influence in names_:
+                return names_.index(influence)
+        raise ValueError(
+            "{} isn't an influence of {}".format(influence, self.deformer)
+        )
+
+    def get(self):
+        """Get the weight of every component in one read.
+
+        Returns:
+            numpy.ndarray: The ``(components,)`` float32 weights. Weights
+            which were never set are 1.0, as in Maya.
+        """
+        if self.node_type == "skinCluster":
+            filter_ = bgdev.api.core.as_skincluster(self.deformer)
+            dag = self.dag
+            components = bgdev.api.skincluster.get_vertex_components(dag)
+            weights = filter_.getWeights(dag, components, self.index)
+            return np.array(weights, dtype=np.float32)
+
+        result = np.ones(self.count, dtype=np.float32)
+        plug = bgdev.api.core.as_plug(self.plug)
+        indices = np.array(plug.getExistingArrayAttributeIndices(), int)
+        if len(indices):
+            values = np.ravel(cmds.getAttr(self.plug))
+            valid = indices < len(result)
+            result[indices[valid]] = values[valid]
+        return result
+
+    def set(self, weights):
+        """Set the weight of every component in one write.
+
+        Args:
+            weights (numpy.ndarray): The ``(components,)`` weights.
+
+        Raises:
+            ValueError: If the amount of weights doesn't match the geometry.
+        """
+        weights = np.asarray(weights, dtype=np.float32).ravel()
+        count = self.count
+        if len(weights) != count:
+            raise ValueError(
+                "{} weights given, {} has {} components.".format(
+                    len(weights), self.deformer, count
+                )
+            )
+        if not count:
+            return
+
+        if self.node_type == "skinCluster":
+            bgdev.api.skincluster.set_weights(
+                self.deformer, weights.tolist(), [self.index]
+            )
+            return
+
+        cmds.setAttr(
+            "{}[0:{}]".format(self.plug, count - 1),
+            *weights.tolist(),
+            size=count
+        )
+
+
+class WeightMap(object):
+    """Per-vertex weights of a mesh supporting NumPy arithmetic.
+
+    Maps combine with each other, with arrays and with numbers using the
+    usual operators, and are applied onto any deformer supported by
+    :class:`DeformerWeights` in one call::
+
+        mask = WeightMap.radial("body", (0, 150, 0), radius=20.0)
+        mask *= ~WeightMap.from_deformer("cluster1")
+        mask.clamp().apply("ffd1")
+
+    Args:
+        mesh (str): Name of the mesh.
+        values (numpy.ndarray or float): The per-vertex weights, or a
+            constant weight for all the vertices.
+
+    """
+
+    __array_ufunc__ = None  # let numpy use the operators below
+
+    def __init__(self, mesh, values=1.0):
+        self.mesh = mesh
+        values = np.asarray(values, dtype=np.float32)
+        if not values.ndim:
+            count = cmds.polyEvaluate(mesh, vertex=True)
+            values = np.full(count, values, dtype=np.float32)
+        self.values = values.ravel()
+
+    def __repr__(self):
+        return "{}({!r}, vertices={})".format(
+            self.__class__.__name__, self.mesh, len(self)
+        )
+
+    def __len__(self):
+        return len(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values if dtype is None else self.values.astype(dtype)
+        return values.copy() if copy else values
+
+    def __add__(self, other):
+        return self.operate(other, np.add)
+
+    def __radd__(self, other):
+        return self.operate(other, np.add, reflected=True)
+
+    def __sub__(self, other):
+        return self.operate(other, np.subtract)
+
+    def __rsub__(self, other):
+        return self.operate(other, np.subtract, reflected=True)
+
+    def __mul__(self, other):
+        return self.operate(other, np.multiply)
+
+    def __rmul__(self, other):
+        return self.operate(other, np.multiply, reflected=True)
+
+    def __truediv__(self, other):
+        return self.operate(other, np.true_divide)
+
+    def __rtruediv__(self, other):
+        return self.operate(other, np.true_divide, reflected=True)
+
+    __div__, __rdiv__ = __truediv__, __rtruediv__
+
+    def __neg__(self):
+        return WeightMap(self.mesh, -self.values)
+
+    def __invert__(self):
+        return self.invert()
+
+    def operate(self, other, func, reflected=False):
+        """Combine this map with another map, an array or a number.
+
+        Args:
+            other (WeightMap or numpy.ndarray or float): The other operand.
+            func (numpy.ufunc): The operation to apply.
+            reflected (bool): Use this map as the second operand if True.
+
+        Raises:
+            ValueError: If the other map has a different amount of vertices.
+
+        Returns:
+            WeightMap: The resulting map.
+        """
+        if isinstance(other, WeightMap):
+            if len(other) != len(self):
+                raise ValueError(
+                    "Can't combine maps of {} and {} vertices.".format(
+                        len(self), len(other)
+                    )
+                )
+            other = other.values
+        other = np.asarray(other, dtype=np.float32)
+        args = (other, self.values) if reflected else (self.values, other)
+        return WeightMap(self.mesh, func(*args, dtype=np.float32))
+
+    def copy(self):
+        """Get a copy of this map."""
+        return WeightMap(self.mesh, self.values.copy())
+
+    def invert(self):
+        """Get the map of ``1 - weights``."""
+        return 1.0 - self
+
+    def clamp(self, minimum=0.0, maximum=1.0):
+        """Get the map with the weights clamped between given values."""
+        return WeightMap(self.mesh, np.clip(self.values, minimum, maximum))
+
+    def remap(self, curve):
+        """Remap the weights through a piecewise linear curve.
+
+        Args:
+            curve (list): The ``(input, output)`` points of the curve,
+                sorted by input. Weights outside of the curve get the value
+                of its closest end.
+
+        Returns:
+            WeightMap: The remapped map.
+        """
+        inputs, outputs = np.asarray(curve, dtype=np.float32).T
+        return WeightMap(self.mesh, np.interp(self.values, inputs, outputs))
+
+    def apply(self, deformer, index=None, geometry=None):
+        """Write the weights onto given deformer in one call.
+
+        Args:
+            deformer (str): Name of the deformer.
+            index (int or str): The map to write, see
+                :class:`DeformerWeights`.
+            geometry (int): Index of the mesh on the deformer. Found from
+                the mesh if None.
+        """
+        if geometry is None:
+            shape = bgdev.api.core.as_dag(self.mesh, to_shape=True)
+            filter_ = bgdev.api.core.as_filter(deformer)
+            geometry = filter_.indexForOutputShape(shape.node())
+        DeformerWeights(deformer, index=index, geometry=geometry).set(self)
+
+    @classmethod
+    def from_deformer(cls, deformer, index=None, geometry=0):
+        """Read a map from given deformer.
+
+        Args:
+            deformer (str): Name of the deformer.
+            index (int or str): The map to read, see :class:`DeformerWeights`.
+            geometry (int): Index of the deformed mesh.
+
+        Returns:
+            WeightMap: The deformer weights.
+        """
+        weights = DeformerWeights(deformer, index=index, geometry=geometry)
+        return cls(weights.dag.partialPathName(), weights.get())
+
+    @classmethod
+    def radial(cls, mesh, center, radius, falloff="smooth"):
+        """Create a map fading out away from a point.
+
+        Distances are measured on the rest points of the mesh, so the map
+        doesn't depend on the current pose.
+
+        Args:
+            mesh (str): Name of the mesh.
+            center (list): The world space position where weights are 1.0.
+            radius (float): Distance where weights reach 0.0.
+            falloff (str): Can be "linear" or "smooth".
+
+        Returns:
+            WeightMap: The falloff map.
+        """
+        delta = get_rest_points(mesh) - np.asarray(center, dtype=np.float64)
+        distances = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        return cls(mesh, get_falloff(distances, radius, falloff))
+
+    @classmethod
+    def from_curve(  # pylint: disable=too-many-arguments
+        cls, mesh, curve, radius, falloff="smooth", samples=100
+    ):
+        """Create a map fading out away from a curve.
+
+        Args:
+            mesh (str): Name of the mesh.
+            curve (str): Name of the nurbs curve where weights are 1.0.
+            radius (float): Distance where weights reach 0.0.
+            falloff (str): Can be "linear" or "smooth".
+            samples (int): Amount of points sampled along the curve.
+
+        Returns:
+            WeightMap: The falloff map.
+        """
+        polyline = get_curve_points(curve, samples)
+        distances = bgdev.utils.spatial.segment_distances(
+            get_rest_points(mesh), polyline[:-1], polyline[1:]
+        ).min(axis=1)
+        return cls(mesh, get_falloff(distances, radius, falloff))
+
+
+def get_falloff(distances, radius, falloff="smooth"):
+    """Turn distances into weights going from 1.0 to 0.0 at given radius.
+
+    Args:
+        distances (numpy.ndarray): The distances.
+        radius (float): Distance where weights reach 0.0.
+        falloff (str): Can be "linear" or "smooth" (smoothstep).
+
+    Raises:
+        ValueError: If the falloff isn't supported.
+
+    Returns:
+        numpy.ndarray: The float32 weights.
+    """
+    if falloff not in FALLOFFS:
+        raise ValueError("Unknown falloff: {}".format(falloff))
+    weights = np.clip(1.0 - np.asarray(distances) / radius, 0.0, 1.0)
+    if falloff == "smooth":
+        weights = weights * weights * (3.0 - 2.0 * weights)
+    return weights.astype(np.float32)
+
+
+def get_rest_points(mesh):
+    """Get the world space points of given mesh before deformation."""
+    return bgdev.utils.mesh.get_points(bgdev.utils.mesh.get_rest_shape(mesh))
+
+
+def get_curve_points(curve, samples=100):
+    """Sample world space points evenly along given nurbs curve.
+
+    Args:
+        curve (str): Name of the nurbs curve.
+        samples (int): Amount of points to sample.
+
+    Returns:
+        numpy.ndarray: The ``(samples x 3)`` points.
+    """
+    mfn = OpenMaya.MFnNurbsCurve(bgdev.api.core.as_dag(curve, to_shape=True))
+    length = mfn.length()
+    points = OpenMaya.MPointArray()
+    for i in range(samples):
+        param = mfn.findParamFromLength(length * i / max(samples - 1, 1))
+        points.append(mfn.getPointAtParam(param, OpenMaya.MSpace.kWorld))
+    return bgdev.api.core.as_numpy_points(points)
+
+
 def transfer_base_weights_api(source, target, src_joint=0, tgt_joint=0):
     """Transfer weights from source to target using OpenMaya.
 
+    On blendShapes, the weights of the first target are transferred.
+
     Args:
         source (str): Source deformer
         target (str): Target deformer
-        joint (int): Index of joint in skinCluster
+        src_joint (int): Index of joint in the source skinCluster
+        tgt_joint (int): Index of joint in the target skinCluster
 
     """
-    weight_plug = {
-        "blendShape": "{}.inputTarget[0].inputTargetGroup[0].targetWeights[{}]",
-        "nonLinear": "{}.weightList[0].weights[{}]",
-        "cluster": "{}.weightList[0].weights[{}]",
-        "ffd": "{}.weightList[0].weights[{}]",
-        "skinCluster": "{}.weightList[{}].weights[{}]",
-    }
-
-    shape = cmds.findType(source, type="mesh")[0]
-    mesh = cmds.listRelatives(shape, parent=True)[0]
-    source_type, target_type = cmds.nodeType(source), cmds.nodeType(target)
-    mesh_sel = OpenMaya.MGlobal.getSelectionListByName(mesh)
-    mesh_dag = mesh_sel.getDagPath(0)
-    mesh_mfn = OpenMaya.MFnMesh(mesh_dag)
-    vertices = set(mesh_mfn.getVertices()[-1])
-    for i in vertices:
-        plug_selection = OpenMaya.MSelectionList()
-        args = [i, src_joint] if source_type == "skinCluster" else [i]
-        plug_selection.add(weight_plug[source_type].format(source, *args))
-        args = [i, tgt_joint] if target_type == "skinCluster" else [i]
-        plug_selection.add(weight_plug[target_type].format(target, *args))
-        value = plug_selection.getPlug(0).asFloat()
-        plug_selection.getPlug(1).setFloat(value)
+    weights = DeformerWeights(source, index=src_joint).get()
+    DeformerWeights(target, index=tgt_joint).set(weights)
 
 
 def transfer_base_weights(source, target, joint=0):
     """Transfer weights from source to target.
 
+    On blendShapes, the base weights are transferred.
+
     Args:
         source (str): Source deformer
         target (str): Target deformer
         joint (int): Index of joint in skinCluster
 
     """
-    weight_plugs = {
-        "nonLinear": "{}.weightList[0].weights[{}]",
-        "skinCluster": "{}.weightList[{}].weights[{}]",
-        "blendShape": "{}.inputTarget[0].baseWeights[{}]",
-    }
-
-    mesh = cmds.listConnections(source, type="mesh")[0]
-    vertices = sorted(cmds.ls("{}.vtx[*]".format(mesh), flatten=True))
-    for i, _ in enumerate(vertices):
-
-        # get weights from source
-        nodetype = cmds.nodeType(source)
-        nodetype = "nonLinear" if nodetype not in weight_plugs else nodetype
-        if nodetype == "skinCluster":
-            attr = weight_plugs[nodetype].format(source, i, joint)
-        else:
-            attr = weight_plugs[nodetype].format(source, i)
-        value = cmds.getAttr(attr)
-
-        # set weights on target
-        nodetype = cmds.nodeType(target)
-        nodetype = "nonLinear" if nodetype not in weight_plugs else nodetype
-        if nodetype == "skinCluster":
-            attr = weight_plugs[nodetype].format(target, i, joint)
-        else:
-            attr = weight_plugs[nodetype].format(target, i)
-        cmds.setAttr(attr, value)
+    indices = {}
+    for node in (source, target):
+        is_skin = cmds.nodeType(node) == "skinCluster"
+        indices[node] = joint if is_skin else None
+    weights = DeformerWeights(source, index=indices[source]).get()
+    DeformerWeights(target, index=indices[target]).set(weights)
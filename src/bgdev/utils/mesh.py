@@ -6,15 +6,21 @@
 from __future__ import absolute_import
 
 import logging
+from collections import OrderedDict
 
+import numpy as np
 from maya import cmds
 from maya.api import OpenMaya
 
 import bgdev.api.core
 import bgdev.utils.decorator
+import bgdev.utils.weightarray
 
 LOG = logging.getLogger(__name__)
 
+ADJACENCY_CACHE = OrderedDict()
+ADJACENCY_CACHE_SIZE = 16
+
 
 def extract_from_shape_orig(mesh):
     """Create new mesh from shape orig."""
@@ -29,6 +35,209 @@ def extract_from_shape_orig(mesh):
     return transform
 
 
+def get_rest_shape(mesh):
+    """Get the original shape of given deformed mesh, or the mesh itself."""
+    result = cmds.deformableShape(mesh, originalGeometry=True) or [""]
+    return result[0].split(".")[0] or mesh
+
+
+def get_topology_hash(mesh):
+    """Get a hash of the given mesh's topology.
+
+    Only the face-vertex connections are hashed, so moving points around
+    doesn't change the hash, but adding or reordering vertices does.
+
+    Args:
+        mesh (str): Name of the mesh.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    counts, connects = bgdev.api.core.as_mesh(mesh).getVertices()
+    return bgdev.utils.weightarray.hash_arrays(
+        np.fromiter(counts, dtype=np.int32, count=len(counts)),
+        np.fromiter(connects, dtype=np.int32, count=len(connects)),
+    )
+
+
+def get_adjacency(mesh):
+    """Get the vertex adjacency of given mesh as a CSR matrix.
+
+    The adjacency only depends on the topology, so it is cached by
+    :func:`get_topology_hash` and shared between meshes and calls.
+
+    Args:
+        mesh (str): Name of the mesh.
+
+    Returns:
+        tuple: The ``(indptr, indices)`` arrays. The neighbours of vertex
+        ``i`` are ``indices[indptr[i]:indptr[i + 1]]``.
+    """
+    key = get_topology_hash(mesh)
+    if key in ADJACENCY_CACHE:
+        ADJACENCY_CACHE[key] = ADJACENCY_CACHE.pop(key)
+        return ADJACENCY_CACHE[key]
+
+    mfn = bgdev.api.core.as_mesh(mesh)
+    counts, connects = mfn.getVertices()
+    counts = np.array(counts, dtype=np.int64)
+    connects = np.array(connects, dtype=np.int64)
+
+    # each face-vertex is connected to the next one of its face
+    following = np.arange(1, len(connects) + 1)
+    following[np.cumsum(counts) - 1] = np.cumsum(counts) - counts
+    edges = np.concatenate(
+        [
+            connects * mfn.numVertices + connects[following],
+            connects[following] * mfn.numVertices + connects,
+        ]
+    )
+    rows, indices = np.divmod(np.unique(edges), mfn.numVertices)
+    indptr = np.zeros(mfn.numVertices + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=mfn.numVertices))
+
+    ADJACENCY_CACHE[key] = (indptr, indices)
+    while len(ADJACENCY_CACHE) > ADJACENCY_CACHE_SIZE:
+        ADJACENCY_CACHE.popitem(last=False)
+    return indptr, indices
+
+
+def get_points(mesh, world=True):
+    """Get the position of all vertices of given mesh.
+
+    Args:
+        mesh (str): Name of the mesh.
+        world (bool): Get the points in world space if True.
+
+    Returns:
+        numpy.ndarray: The ``(vertices x 3)`` positions.
+    """
+    space = OpenMaya.MSpace.kWorld if world else OpenMaya.MSpace.kObject
+    points = bgdev.api.core.as_mesh(mesh).getPoints(space)
+    return bgdev.api.core.as_numpy_points(points)
+
+
+def get_face_vertex_triangles(mesh):
+    """Get the face-vertex indices of each triangle of given mesh.
+
+    Face-vertices index the per-face arrays of the mesh (vertex ids,
+    uv ids, etc.), which is what ties the triangles to their UVs.
+
+    Args:
+        mesh (str): Name of the mesh.
+
+    Returns:
+        numpy.ndarray: The ``(triangles x 3)`` face-vertex indices.
+    """
+    mfn = bgdev.api.core.as_mesh(mesh)
+    counts = np.array(mfn.getVertices()[0], dtype=np.int64)
+    tri_counts, tri_offsets = mfn.getTriangleOffsets()
+    starts = np.cumsum(counts) - counts
+    faces = np.repeat(np.arange(len(counts)), np.array(tri_counts) * 3)
+    offsets = np.array(tri_offsets, dtype=np.int64)
+    return (starts[faces] + offsets).reshape(-1, 3)
+
+
+def get_triangles(mesh):
+    """Get the vertex indices of each triangle of given mesh.
+
+    Args:
+        mesh (str): Name of the mesh.
+
+    Returns:
+        numpy.ndarray: The ``(triangles x 3)`` vertex indices.
+    """
+    connects = np.array(bgdev.api.core.as_mesh(mesh).getVertices()[1])
+    return connects[get_face_vertex_triangles(mesh)].astype(np.int32)
+
+
+def get_uvs(mesh, uv_set=None):
+    """Get the UVs of given mesh and their id on each face-vertex.
+
+    Args:
+        mesh (str): Name of the mesh.
+        uv_set (str): Name of the uv set. Use the current one if None.
+
+    Returns:
+        tuple: The ``(uvs x 2)`` coordinates and the uv id of each
+        face-vertex, which is -1 on faces without UVs.
+    """
+    mfn = bgdev.api.core.as_mesh(mesh)
+    uv_set = uv_set or mfn.currentUVSetName()
+    us, vs = mfn.getUVs(uv_set)
+    uvs = np.column_stack([np.array(us), np.array(vs)]).reshape(-1, 2)
+
+    counts = np.array(mfn.getVertices()[0], dtype=np.int64)
+    uv_counts, uv_ids = mfn.getAssignedUVs(uv_set)
+    mapped = np.repeat(np.array(uv_counts) > 0, counts)
+    face_uvs = np.full(len(mapped), -1, dtype=np.int64)
+    face_uvs[mapped] = np.array(uv_ids, dtype=np.int64)
+    return uvs, face_uvs
+
+
+def get_uv_triangles(mesh, uv_set=None):
+    """Get the UVs of given mesh and the uv ids of each triangle.
+
+    Triangles are in the same order as :func:`get_triangles`.
+
+    Args:
+        mesh (str): Name of the mesh.
+        uv_set (str): Name of the uv set. Use the current one if None.
+
+    Returns:
+        tuple: The ``(uvs x 2)`` coordinates and ``(triangles x 3)`` uv ids,
+        which are -1 on triangles without UVs.
+    """
+    uvs, face_uvs = get_uvs(mesh, uv_set)
+    return uvs, face_uvs[get_face_vertex_triangles(mesh)].astype(np.int32)
+
+
+def get_vertex_uvs(mesh, uv_set=None):
+    """Get one UV coordinate per vertex of given mesh.
+
+    Vertices on a UV seam have several UVs, only one of them is returned.
+
+    Args:
+        mesh (str): Name of the mesh.
+        uv_set (str): Name of the uv set. Use the current one if None.
+
+    Returns:
+        numpy.ndarray: The ``(vertices x 2)`` coordinates, NaN for vertices
+        without UVs.
+    """
+    mfn = bgdev.api.core.as_mesh(mesh)
+    uvs, face_uvs = get_uvs(mesh, uv_set)
+    connects = np.array(mfn.getVertices()[1], dtype=np.int64)
+    result = np.full((mfn.numVertices, 2), np.nan)
+    mapped = face_uvs >= 0
+    result[connects[mapped]] = uvs[face_uvs[mapped]]
+    return result
+
+
+def set_vertex_colors(mesh, colors, color_set):
+    """Set the colour of every vertex of given mesh in one call.
+
+    The colour set is created if needed, made current and displayed.
+
+    Args:
+        mesh (str): Name of the mesh.
+        colors (numpy.ndarray): The ``(vertices x 3)`` RGB colours.
+        color_set (str): Name of the colour set.
+    """
+    if color_set not in (
+        cmds.polyColorSet(mesh, query=True, allColorSets=True) or []
+    ):
+        cmds.polyColorSet(mesh, create=True, colorSet=color_set)
+    cmds.polyColorSet(mesh, currentColorSet=True, colorSet=color_set)
+
+    mfn = bgdev.api.core.as_mesh(mesh)
+    mfn.setVertexColors(
+        OpenMaya.MColorArray([OpenMaya.MColor(list(x)) for x in colors]),
+        OpenMaya.MIntArray(range(len(colors))),
+    )
+    cmds.setAttr(mfn.fullPathName() + ".displayColors", True)
+
+
 def mesh_combine_and_keep(nodes, name, visible=True):
     """Combine meshes and keep the original."""
     combined, unite = cmds.polyUnite(nodes, constructionHistory=True)
@@ -0,0 +1,279 @@
+"""Bake deformed meshes to a compressed point cache and replay it.
+
+The timeline is stepped once per frame and every mesh is read at each step,
+so the deformer stack is evaluated once per frame for all the meshes. Each
+mesh is stored as its rest points and the per-frame deltas from them, in
+chunks of frames compressed with zlib::
+
+    bake_deformation(["body", "shirt"], 1, 120, "/tmp/shot.ptc")
+    cache = PointCache("/tmp/shot.ptc")
+    cache.play({"body": "body_proxy", "shirt": ("shirt_blendShape", 0)})
+
+The file reuses the layout of :class:`bgdev.utils.weightfile.PackWriter`,
+with one block per mesh chunk and a ``header`` block, so any chunk can be
+read without going through the others.
+
+:created: 17/10/2026
+:author: Benoit Gielly <benoit.gielly@gmail.com>
+"""
+from __future__ import absolute_import, division
+
+import json
+import logging
+import os
+import time
+import weakref
+import zlib
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya
+
+import bgdev.api.blendshape
+import bgdev.api.core
+import bgdev.utils.mesh
+import bgdev.utils.weightfile
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b"BGPTCPK\n"
+CHUNK_SIZE = 32
+HEADER = "header"
+
+
+class CacheWriter(bgdev.utils.weightfile.PackWriter):
+    """Stream compressed point cache blocks into one file."""
+
+    MAGIC = MAGIC
+
+
+def get_block_name(mesh, chunk):
+    """Get the name of a block of given mesh, ``rest`` or a chunk index."""
+    return "{}/{}".format(mesh, chunk)
+
+
+def bake_deformation(  # pylint: disable=too-many-arguments,too-many-locals
+    meshes, start, end, path, step=1, chunk_size=CHUNK_SIZE, level=6
+):
+    """Bake the deformation of given meshes over a frame range.
+
+    The points are read in object space into preallocated arrays, and each
+    chunk of frames is compressed and written as soon as it's full so the
+    memory doesn't grow with the frame range.
+
+    Args:
+        meshes (list): Names of the deformed meshes.
+        start (float): First frame to bake.
+        end (float): Last frame to bake, included.
+        path (str): Path of the cache file.
+        step (float): Frame increment.
+        chunk_size (int): Amount of frames stored in each block.
+        level (int): The zlib compression level.
+
+    Returns:
+        dict: The "frames" count, the "size" of the file in bytes and the
+        "time" spent in seconds.
+    """
+    frames = np.arange(start, end + step * 0.5, step)
+    mfns, rests, buffers = {}, {}, {}
+    for mesh in meshes:
+        mfns[mesh] = bgdev.api.core.as_mesh(mesh)
+        rest = bgdev.utils.mesh.get_rest_shape(mesh)
+        rests[mesh] = bgdev.utils.mesh.get_points(rest, world=False)
+        rests[mesh] = rests[mesh].astype(np.float32)
+        shape = (min(chunk_size, len(frames)), len(rests[mesh]), 3)
+        buffers[mesh] = np.empty(shape, dtype=np.float32)
+
+    header = {
+        "start": float(start),
+        "step": float(step),
+        "frames": len(frames),
+        "chunk_size": chunk_size,
+        "meshes": {x: len(y) for x, y in rests.items()},
+    }
+    current = cmds.currentTime(query=True)
+    begin = time.time()
+    with CacheWriter(path) as writer:
+        for mesh, rest in rests.items():
+            block = zlib.compress(rest.tobytes(), level)
+            writer.write(get_block_name(mesh, "rest"), block)
+
+        try:
+            for i, frame in enumerate(frames):
+                cmds.currentTime(frame, update=True)
+                slot = i % chunk_size
+                for mesh, mfn in mfns.items():
+                    points = mfn.getPoints(OpenMaya.MSpace.kObject)
+                    buffers[mesh][slot] = bgdev.api.core.as_numpy_points(
+                        points, np.float32
+                    )
+                    buffers[mesh][slot] -= rests[mesh]
+
+                if slot == chunk_size - 1 or i == len(frames) - 1:
+                    for mesh, buffer_ in buffers.items():
+                        block = buffer_[: slot + 1].tobytes()
+                        writer.write(
+                            get_block_name(mesh, i // chunk_size),
+                            zlib.compress(block, level),
+                        )
+        finally:
+            cmds.currentTime(current, update=True)
+        writer.write(HEADER, json.dumps(header).encode("utf-8"))
+
+    # the table of contents is only written when the writer closes
+    result = {
+        "frames": len(frames),
+        "size": os.path.getsize(path),
+        "time": time.time() - begin,
+    }
+    LOG.info(
+        "Baked %s meshes over %s frames in %.2fs (%s bytes).",
+        len(meshes),
+        result["frames"],
+        result["time"],
+        result["size"],
+    )
+    return result
+
+
+class PointCache(object):
+    """Read a point cache written by :func:`bake_deformation`.
+
+    Only the blocks needed are read, and the last chunk of each mesh is kept
+    decompressed so playing frames in order reads each chunk once.
+
+    Args:
+        path (str): Path of the cache file.
+
+    Raises:
+        ValueError: If the file isn't a point cache.
+
+    """
+
+    def __init__(self, path):
+        self.callback = None
+        self.path = path
+        self.index = bgdev.utils.weightfile.read_index(path)
+        if self.index is None or HEADER not in self.index:
+            raise ValueError("Not a valid point cache: {}".format(path))
+        self.header = json.loads(self.read(HEADER).decode("utf-8"))
+        self.rests = {}
+        self.chunks = {}
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.path)
+
+    def __del__(self):
+        self.stop()
+
+    @property
+    def meshes(self):
+        """list: Names of the cached meshes."""
+        return sorted(self.header["meshes"])
+
+    @property
+    def frames(self):
+        """numpy.ndarray: The cached frames."""
+        start, step = self.header["start"], self.header["step"]
+        return start + np.arange(self.header["frames"]) * step
+
+    def read(self, name):
+        """Read and decompress the block of given name."""
+        offset, size = self.index[name]
+        with open(self.path, "rb") as stream:
+            stream.seek(offset)
+            block = stream.read(size)
+        return block if name == HEADER else zlib.decompress(block)
+
+    def get_rest(self, mesh):
+        """Get the ``(vertices x 3)`` object space rest points of a mesh."""
+        if mesh not in self.rests:
+            buffer_ = self.read(get_block_name(mesh, "rest"))
+            self.rests[mesh] = np.frombuffer(buffer_, np.float32)
+            self.rests[mesh] = self.rests[mesh].reshape(-1, 3)
+        return self.rests[mesh]
+
+    def get_frame_index(self, frame):
+        """Get the index of the cached frame closest to given frame."""
+        index = int(
+            round((frame - self.header["start"]) / self.header["step"])
+        )
+        return min(max(index, 0), self.header["frames"] - 1)
+
+    def get_deltas(self, mesh, frame):
+        """Get the offsets of a mesh from its rest points at given frame.
+
+        Args:
+            mesh (str): Name of the cached mesh.
+            frame (float): The frame, clamped to the cached range.
+
+        Returns:
+            numpy.ndarray: The ``(vertices x 3)`` float32 deltas.
+        """
+        chunk, slot = divmod(
+            self.get_frame_index(frame), self.header["chunk_size"]
+        )
+        if self.chunks.get(mesh, (None,))[0] != chunk:
+            buffer_ = self.read(get_block_name(mesh, chunk))
+            array = np.frombuffer(buffer_, np.float32)
+            count = self.header["meshes"][mesh]
+            self.chunks[mesh] = (chunk, array.reshape(-1, count, 3))
+        return self.chunks[mesh][1][slot]
+
+    def get_points(self, mesh, frame):
+        """Get the ``(vertices x 3)`` object space points at given frame."""
+        return self.get_rest(mesh) + self.get_deltas(mesh, frame)
+
+    def apply(self, frame, targets=None):
+        """Push the cached points of given frame into the scene.
+
+        Args:
+            frame (float): The frame, clamped to the cached range.
+            targets (dict): Where to send the points of each cached mesh.
+                Either a mesh whose points are set, or a ``(blendshape,
+                index)`` tuple whose target deltas are set. Defaults to
+                setting the points of each cached mesh.
+        """
+        targets = targets or {x: x for x in self.meshes}
+        for mesh, target in targets.items():
+            if isinstance(target, (list, tuple)):
+                deltas = self.get_deltas(mesh, frame)
+                moving = np.flatnonzero(np.any(deltas != 0, axis=1))
+                bgdev.api.blendshape.set_target_deltas(
+                    target[0], target[1], moving, deltas[moving]
+                )
+                continue
+            points = self.get_points(mesh, frame)
+            bgdev.api.core.as_mesh(target).setPoints(
+                bgdev.api.core.as_point_array(points),
+                OpenMaya.MSpace.kObject,
+            )
+
+    def play(self, targets=None):
+        """Apply the cache whenever the current time changes.
+
+        The callback only keeps a weak reference to the cache, so it's
+        removed by :meth:`stop` or when the cache is garbage collected.
+
+        Args:
+            targets (dict): See :meth:`apply`.
+        """
+        self.stop()
+
+        cache = weakref.ref(self)
+
+        def on_time_changed(time_, *_):
+            instance = cache()
+            if instance is not None:
+                instance.apply(time_.value, targets)
+
+        self.callback = OpenMaya.MDGMessage.addTimeChangeCallback(
+            on_time_changed
+        )
+        self.apply(cmds.currentTime(query=True), targets)
+
+    def stop(self):
+        """Stop applying the cache on time changes."""
+        if self.callback is not None:
+            OpenMaya.MMessage.removeCallback(self.callback)
+            self.callback = None
@@ -81,3 +81,33 @@ def convert_side(data, sides="LR", both=False):
         data[key] = values
 
     return next(iter(data.values())) if is_list else data
+
+
+def get_opposite(name, sides="LR"):
+    """Swap the side token of given name.
+
+    Tokens are the underscore separated parts of the name, so it works with
+    the ``{}_name`` convention of :func:`convert_side` as well as with sides
+    in the middle of the name. DAG paths and namespaces are kept as is.
+
+    Args:
+        name (str): The name to mirror (eg. "L_arm_jnt").
+        sides (str): The two side tokens to swap.
+
+    Example:
+        ::
+
+            >>> get_opposite("L_arm_jnt")
+            "R_arm_jnt"
+            >>> get_opposite("rig:spine_01_jnt")
+            "rig:spine_01_jnt"
+
+    Returns:
+        str: The name on the opposite side, or the same name if unsided.
+    """
+    left, right = sides
+    swap = {left: right, right: left}
+    path, separator, leaf = name.rpartition("|")
+    namespace, colon, leaf = leaf.rpartition(":")
+    leaf = "_".join(swap.get(x, x) for x in leaf.split("_"))
+    return path + separator + namespace + colon + leaf
@@ -6,11 +6,20 @@
 from __future__ import absolute_import
 
 import logging
+import numbers
+from collections import OrderedDict
 
+import numpy as np
 from maya import cmds, mel
+from maya.api import OpenMaya
 
+import bgdev.api.skincluster
 import bgdev.utils.decorator
+import bgdev.utils.mesh
 import bgdev.utils.shape
+import bgdev.utils.side
+import bgdev.utils.spatial
+import bgdev.utils.weightarray
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +40,7 @@ def get_skincluster(node):
     """Return the skincluster of given node.
 
     If the passed node already is a skincluster, just return it.
+    Results are cached per node, see :class:`SkinclusterResolver`.
 
     Args:
         node (str): Can be either the skincluster or the bound node.
@@ -41,6 +51,19 @@ def get_skincluster(node):
     Returns:
         str: The skincluster bound to the node.
 
+    """
+    return RESOLVER.resolve(node)
+
+
+def find_skincluster(node):
+    """Search the skincluster of given node, without any cache.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+
+    Returns:
+        str: The skincluster bound to the node.
+
     """
     if cmds.nodeType(node) == "skinCluster":
         return node
@@ -62,6 +85,133 @@ def get_skincluster(node):
     return None
 
 
+class SkinclusterResolver(object):
+    """Memoize the skincluster of nodes, keyed by their UUID.
+
+    The cache is cleared whenever a skincluster is added, removed or
+    renamed, one of its connections changes, or another scene is opened.
+    The callbacks are installed on the first lookup.
+
+    Example:
+        ::
+
+            RESOLVER.resolve_many(cmds.ls(type="mesh"))
+            print(RESOLVER.stats)
+
+    """
+
+    def __init__(self):
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self.callbacks = []
+
+    @property
+    def stats(self):
+        """dict: The cache "hits", "misses" and "size"."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.cache),
+        }
+
+    def install(self):
+        """Register the callbacks invalidating the cache."""
+        if self.callbacks:
+            return
+        self.callbacks = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(
+                self.on_event, "skinCluster"
+            ),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(
+                self.on_event, "skinCluster"
+            ),
+            OpenMaya.MDGMessage.addConnectionCallback(self.on_connection),
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject.kNullObj, self.on_rename
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeNew, self.on_event
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeOpen, self.on_event
+            ),
+        ]
+
+    def uninstall(self):
+        """Remove the callbacks and clear the cache."""
+        if self.callbacks:
+            OpenMaya.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
+        self.clear()
+
+    def on_event(self, *_):
+        """Clear the cache from any callback."""
+        self.clear()
+
+    def on_rename(self, node, *_):
+        """Clear the cache when a skincluster gets renamed."""
+        if node.hasFn(OpenMaya.MFn.kSkinClusterFilter):
+            self.clear()
+
+    def on_connection(self, source, destination, *_):
+        """Clear the cache when a skincluster connection changes."""
+        for plug in (source, destination):
+            if plug.node().hasFn(OpenMaya.MFn.kSkinClusterFilter):
+                self.clear()
+                return
+
+    def clear(self):
+        """Empty the cache, the counters are kept."""
+        self.cache.clear()
+
+    def resolve(self, node):
+        """Get the skincluster of given node.
+
+        Args:
+            node (str): Can be either the skincluster or the bound node.
+
+        Returns:
+            str: The skincluster bound to the node, None if not found.
+        """
+        return self.resolve_many([node])[0]
+
+    def resolve_many(self, nodes):
+        """Get the skincluster of each given node.
+
+        The UUIDs of all the nodes are queried in a single call and only
+        the nodes missing from the cache are searched.
+
+        Args:
+            nodes (list): The skinclusters or bound nodes.
+
+        Returns:
+            list: The skincluster of each node, None if not found.
+        """
+        self.install()
+        nodes = list(nodes)
+        uuids = cmds.ls(nodes, uuid=True) or []
+        if len(uuids) != len(nodes):
+            uuids = [(cmds.ls(x, uuid=True) or [None])[0] for x in nodes]
+
+        result = []
+        for node, uuid in zip(nodes, uuids):
+            if uuid is not None and uuid in self.cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+                skincluster = find_skincluster(node)
+                if uuid is None:
+                    result.append(skincluster)
+                    continue
+                self.cache[uuid] = skincluster
+            result.append(self.cache[uuid])
+        return result
+
+
+RESOLVER = SkinclusterResolver()
+
+
 def get_influences(node, weighted=False):
     """Get influences of given skincluster.
 
@@ -87,6 +237,127 @@ def get_influences(node, weighted=False):
     return influences
 
 
+def get_weights(node, vertices=None):
+    """Get the skin weights of given node as a dense array.
+
+    The weights are read in a single `MFnSkinCluster.getWeights` call.
+    Columns follow the order of :func:`get_influences`.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+        vertices (list): List of vertex indices. Use all vertices if None.
+
+    Raises:
+        RuntimeError: If the skincluster cannot be found.
+
+    Returns:
+        numpy.ndarray: The ``(vertices x influences)`` weight array.
+    """
+    skc = get_skincluster(node)
+    if not skc:
+        raise RuntimeError("Couldn't find a skincluster.")
+
+    weights, count = bgdev.api.skincluster.get_weights(skc, vertices)
+    return bgdev.utils.weightarray.from_flat(weights, count)
+
+
+def set_weights(node, array, influences=None, vertices=None, normalize=False):
+    """Set the skin weights of given node from a dense array.
+
+    The weights are written in a single `MFnSkinCluster.setWeights` call.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        influences (list): Names or indices of the influences matching the
+            array columns. Use all influences, in order, if None.
+        vertices (list): Vertex indices matching the array rows.
+            Use all vertices if None.
+        normalize (bool): Let Maya normalize the weights if True.
+
+    Raises:
+        RuntimeError: If the skincluster cannot be found.
+    """
+    skc = get_skincluster(node)
+    if not skc:
+        raise RuntimeError("Couldn't find a skincluster.")
+
+    all_influences = bgdev.api.skincluster.get_influences(skc)
+    if influences is None:
+        columns = list(range(len(all_influences)))
+    elif all(isinstance(x, numbers.Integral) for x in influences):
+        columns = [int(x) for x in influences]
+    else:
+        names = [x.rpartition("|")[-1] for x in influences]
+        short = [x.rpartition("|")[-1] for x in all_influences]
+        columns = bgdev.utils.weightarray.get_columns(short, names)
+
+    if vertices is not None:
+        vertices = [int(x) for x in vertices]
+    rows = None if vertices is None else len(vertices)
+    array = bgdev.utils.weightarray.check_shape(array, rows, len(columns))
+    values = bgdev.utils.weightarray.to_flat(array).tolist()
+    bgdev.api.skincluster.set_weights(
+        skc, values, columns, vertices, normalize
+    )
+
+
+def keep_weights(node):
+    """Capture the weights of given node before a write that can't be undone.
+
+    `MFnSkinCluster.setWeights` isn't undoable from Python, so the
+    interactive tools writing with it keep the previous weights in
+    :data:`bgdev.utils.weightsnapshot.HISTORY` first, where
+    :func:`restore_weights_callback` finds them back.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+
+    Returns:
+        Snapshot: The captured weights, None if there is no skincluster.
+    """
+    # pylint: disable=import-outside-toplevel
+    import bgdev.utils.weightsnapshot
+
+    if not get_skincluster(node):
+        return None
+    snapshot = bgdev.utils.weightsnapshot.capture(node)
+    LOG.info(
+        "Undo won't restore the weights of %s, use "
+        "restore_weights_callback instead (%s).",
+        snapshot.skincluster,
+        snapshot.label,
+    )
+    return snapshot
+
+
+@bgdev.utils.decorator.REPEAT
+def restore_weights_callback():
+    """Restore the weights kept by :func:`keep_weights` on the selection.
+
+    The latest captured snapshot of each selected skincluster is written
+    back and dropped from the history, so calling it again goes further
+    back.
+    """
+    # pylint: disable=import-outside-toplevel
+    import bgdev.utils.weightsnapshot
+
+    selection = cmds.ls(selection=True, objectsOnly=True)
+    if not selection:
+        LOG.warning("Please select at least 1 node!")
+        return
+
+    history = bgdev.utils.weightsnapshot.HISTORY
+    for skc in OrderedDict.fromkeys(get_skincluster(x) for x in selection):
+        snapshot = history.get(skc) if skc else None
+        if not snapshot:
+            LOG.warning("No weights kept for %s.", skc)
+            continue
+        bgdev.utils.weightsnapshot.restore(snapshot)
+        history.remove(snapshot)
+        LOG.info("Restored %s weights (%s).", skc, snapshot.label)
+
+
 @bgdev.utils.decorator.UNDO_REPEAT
 def add_influences_callback():
     """Call back :func:`add_influences`."""
@@ -139,14 +410,26 @@ def remove_influences_callback(unused=False):
         remove_influences(node, joints)
 
 
-def remove_influences(node, joints=None, unused=False, disconnect=False):
+def remove_influences(  # pylint: disable=too-many-arguments
+    node, joints=None, unused=False, disconnect=False, modifier=False
+):
     """Remove given joints from the skincluster.
 
+    Unused influences are found from the weight array, and all the
+    influences are removed with a single `cmds.skinCluster` edit instead of
+    one edit per influence, so it can still be undone.
+
     Args:
         node (str): Can be either the skincluster or the bound node.
         joints (list): List of joints/influences to add.
         unused (bool): Removed all unused influences found.
             This flag ignores `joints` when used.
+        disconnect (bool): Only disconnect the influences, keeping their
+            current matrix.
+        modifier (bool): Remove the unused influences with
+            :func:`bgdev.api.skincluster.remove_influences` instead.
+            It doesn't go through `cmds.skinCluster` but can't be undone,
+            so only use it in batch.
 
     Raises:
         RuntimeError: If the skincluster cannot be found.
@@ -157,23 +440,222 @@ def remove_influences(node, joints=None, unused=False, disconnect=False):
         LOG.warning("Couldn't find a skincluster onto %s.", node)
         return
 
-    influences = get_influences(skc)
     if unused:
-        weighted = get_influences(skc, weighted=True)
-        joints = list(set(influences) - set(weighted))
-        LOG.info("Found %s influences to remove in %s", len(joints), skc)
+        array = get_weights(skc)
+        indices = np.flatnonzero(~array.any(axis=0)).tolist()
+        LOG.info("Found %s influences to remove in %s", len(indices), skc)
+        if indices and modifier and not disconnect:
+            bgdev.api.skincluster.remove_influences(skc, indices)
+            return
+        influences = bgdev.api.skincluster.get_influences(skc)
+        joints = [influences[x] for x in indices]
+
+    influences = get_influences(skc)
+    joints = [x for x in joints if x in influences]
+    if not disconnect:
+        if joints:
+            cmds.skinCluster(skc, edit=True, removeInfluence=joints)
+        return
 
     for each in joints:
-        if each not in influences:
-            continue
-        if disconnect:
-            index = influences.index(each)
-            plug = "{}.matrix[{}]".format(skc, index)
-            value = cmds.getAttr(plug)
-            cmds.disconnectAttr(each + ".worldMatrix", plug)
-            cmds.setAttr(plug, value, type="matrix")
+        index = influences.index(each)
+        plug = "{}.matrix[{}]".format(skc, index)
+        value = cmds.getAttr(plug)
+        cmds.disconnectAttr(each + ".worldMatrix", plug)
+        cmds.setAttr(plug, value, type="matrix")
+
+
+def get_locked_influences(node):
+    """Get the column indices of the locked influences of a skincluster.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+
+    Returns:
+        list: The indices of the influences with `lockInfluenceWeights` on,
+        in the same order as the weight array columns.
+    """
+    skc = get_skincluster(node)
+    influences = bgdev.api.skincluster.get_influences(skc)
+    return [
+        i
+        for i, each in enumerate(influences)
+        if cmds.attributeQuery("liw", node=each, exists=True)
+        and cmds.getAttr(each + ".liw")
+    ]
+
+
+@bgdev.utils.decorator.UNDO_REPEAT
+def smooth_weights_callback(iterations=1, strength=1.0):
+    """Call back :func:`smooth_weights` on selected meshes or vertices.
+
+    Undo doesn't revert the smoothing, the previous weights are kept with
+    :func:`keep_weights` instead.
+    """
+    selection = cmds.ls(selection=True, flatten=True)
+    if not selection:
+        LOG.warning("Please select at least 1 node!")
+        return
+
+    meshes = OrderedDict()
+    for each in selection:
+        node, _, vertex = each.partition(".vtx[")
+        if vertex:
+            meshes.setdefault(node, []).append(int(vertex[:-1]))
+        else:
+            meshes[node] = None
+    for node, vertices in meshes.items():
+        keep_weights(node)
+        smooth_weights(node, iterations, strength, vertices)
+
+
+def smooth_weights(node, iterations=1, strength=1.0, mask=None):
+    """Smooth the skin weights of given node over its surface.
+
+    The weights are read once, smoothed in NumPy using the cached vertex
+    adjacency of the mesh and written back with a single `setWeights`.
+    Weights of locked influences are kept.
+
+    `MFnSkinCluster.setWeights` can't be undone, see :func:`keep_weights`.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+        iterations (int): Amount of smoothing passes.
+        strength (float): How far towards the average each pass goes.
+        mask (list): Per-vertex smoothing factors, or the indices of the
+            only vertices to smooth. Smooth all vertices if None.
+
+    Raises:
+        RuntimeError: If the skincluster cannot be found.
+    """
+    skc = get_skincluster(node)
+    if not skc:
+        raise RuntimeError("Couldn't find a skincluster.")
+
+    mesh = bgdev.api.skincluster.get_geometry(skc).partialPathName()
+    array = bgdev.utils.weightarray.smooth(
+        get_weights(skc),
+        bgdev.utils.mesh.get_adjacency(mesh),
+        iterations=iterations,
+        strength=strength,
+        mask=mask,
+        locked=get_locked_influences(skc),
+    )
+    set_weights(skc, array)
+
+
+def mirror_weights(node, table, direction="LR", sides="LR"):
+    """Mirror the skin weights of given node using a symmetry table.
+
+    Influences are swapped using the side tokens of their names, then all
+    the weights are mirrored in a single indexing operation and written back
+    with one `setWeights`. Vertices on the symmetry plane are symmetrized.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+        table (dict): The symmetry table of the mesh, or the
+            :class:`bgdev.tools.symmetry_api.Symmetry` holding it.
+        direction (str): "LR" copies the left side of the table onto the
+            right side, "RL" the other way around.
+        sides (str): The side tokens of the influence names.
+            See :func:`bgdev.utils.side.get_opposite`.
+
+    Raises:
+        ValueError: If the direction isn't valid.
+        RuntimeError: If the skincluster cannot be found.
+    """
+    if direction not in ("LR", "RL"):
+        raise ValueError("Unknown direction: {}".format(direction))
+    skc = get_skincluster(node)
+    if not skc:
+        raise RuntimeError("Couldn't find a skincluster.")
+
+    influences = bgdev.api.skincluster.get_influences(skc)
+    lookup = {x: i for i, x in enumerate(influences)}
+    influence_map = [
+        lookup.get(bgdev.utils.side.get_opposite(x, sides), i)
+        for i, x in enumerate(influences)
+    ]
+
+    array = get_weights(skc)
+    vertex_map, vertices = bgdev.utils.weightarray.get_symmetry_map(
+        getattr(table, "table", table), len(array)
+    )
+    destination = "right" if direction == "LR" else "left"
+    array = bgdev.utils.weightarray.mirror(
+        array,
+        vertex_map,
+        influence_map,
+        vertices[destination],
+        vertices["center"],
+    )
+    set_weights(skc, array)
+
+
+@bgdev.utils.decorator.UNDO_REPEAT
+def prune_weights_callback():
+    """Call back :func:`prune_weights`.
+
+    Undo doesn't revert the pruning, the previous weights are kept with
+    :func:`keep_weights` instead.
+    """
+    selection = cmds.ls(selection=True)
+    if not selection:
+        LOG.warning("Please select at least 1 node!")
+        return
+    for node in selection:
+        keep_weights(node)
+    prune_weights(selection)
+
+
+def prune_weights(nodes, max_influences=None, threshold=0.001):
+    """Cap the influences per vertex of given skinned nodes.
+
+    Each skincluster is read and written once, the pruning itself runs on
+    the whole weight array at once. Weights of locked influences are kept.
+
+    The weights are written with `MFnSkinCluster.setWeights` which can't be
+    undone, see :func:`keep_weights`.
+
+    Args:
+        nodes (list): The skinned nodes or skinclusters.
+        max_influences (int): Maximum amount of influences per vertex.
+            Use the ``maximumInfluences`` of the bind settings if None.
+        threshold (float): Remove weights below this value.
+
+    Returns:
+        dict: The "before" and "after" statistics of each node.
+            See :func:`bgdev.utils.weightarray.get_stats`.
+    """
+    if max_influences is None:
+        max_influences = SKINCLUSTER_SETTINGS["maximumInfluences"]
+
+    report = {}
+    for node in cmds.ls(nodes):
+        skc = get_skincluster(node)
+        if not skc:
+            LOG.warning("Couldn't find a skincluster onto %s.", node)
             continue
-        cmds.skinCluster(skc, edit=True, removeInfluence=each)
+
+        array = get_weights(skc)
+        pruned = bgdev.utils.weightarray.prune(
+            array, max_influences, threshold, get_locked_influences(skc)
+        )
+        set_weights(skc, pruned)
+
+        report[node] = {
+            "before": bgdev.utils.weightarray.get_stats(array, max_influences),
+            "after": bgdev.utils.weightarray.get_stats(pruned, max_influences),
+        }
+        LOG.info(
+            "Pruned %s: %s -> %s weights, %s vertices over %s influences.",
+            node,
+            report[node]["before"]["weights"],
+            report[node]["after"]["weights"],
+            report[node]["before"]["over"],
+            max_influences,
+        )
+    return report
 
 
 @bgdev.utils.decorator.UNDO_REPEAT
@@ -191,8 +673,8 @@ def select_influences_callback():
 
 
 @bgdev.utils.decorator.UNDO_REPEAT
-def bind_skincluster_callback():
-    """Call back :func:`bind_skincluster`."""
+def bind_skincluster_callback(bulk=False):
+    """Call back :func:`bind_skincluster` or :func:`bind_skinclusters`."""
     selection = cmds.ls(selection=True)
     if not selection:
         LOG.warning("Please select at least 1 node!")
@@ -200,18 +682,25 @@ def bind_skincluster_callback():
 
     joints = {_ for _ in selection if cmds.nodeType(_) == "joint"}
     nodes = set(selection) - joints
-    for each in nodes:
-        bind_skincluster(each, list(joints))
+    if bulk:
+        if not joints:
+            LOG.warning("Please select at least 1 joint!")
+            return
+        bind_skinclusters(sorted(nodes), sorted(joints))
+    else:
+        for each in nodes:
+            bind_skincluster(each, list(joints))
 
     cmds.select(selection)
 
 
-def bind_skincluster(mesh=None, bones=None):
+def bind_skincluster(mesh=None, bones=None, **kwargs):
     """Create a new skincluster with preset options.
 
     Args:
         mesh (str): Name of the geometry to bind.
         bones (list): List of bones/influences.
+        kwargs: Override the default `cmds.skinCluster` settings.
 
     Returns:
         str: The created skincluster.
@@ -220,6 +709,7 @@ def bind_skincluster(mesh=None, bones=None):
 
     # create a default dictionnary to store the best settings for a skincluster
     default_settings = dict(SKINCLUSTER_SETTINGS)
+    default_settings.update(kwargs)
 
     # if a mesh is given, rename the skincluster accordingly
     if mesh:
@@ -247,28 +737,140 @@ def bind_skincluster(mesh=None, bones=None):
     return skc
 
 
+def bind_skinclusters(meshes, bones, falloff=None, max_influences=None):
+    """Bind many meshes to the same bones and compute their weights at once.
+
+    The skinclusters are created with a single influence per vertex so Maya
+    doesn't spend time on weights which are replaced right after. The
+    weights are then computed in NumPy from the distance of each vertex to
+    the bone segments and written with one `setWeights` per mesh.
+
+    Args:
+        meshes (list): Names of the geometries to bind.
+        bones (list): List of bones/influences shared by all the meshes.
+        falloff (float): How fast the weights decrease with the distance.
+            Use the ``dropoffRate`` of the bind settings if None.
+        max_influences (int): Maximum amount of influences per vertex.
+            Use the ``maximumInfluences`` of the bind settings if None.
+
+    Raises:
+        ValueError: If none of the bones exist.
+
+    Returns:
+        list: The created skinclusters.
+    """
+    if falloff is None:
+        falloff = SKINCLUSTER_SETTINGS["dropoffRate"]
+    if max_influences is None:
+        max_influences = SKINCLUSTER_SETTINGS["maximumInfluences"]
+
+    bones = cmds.ls(bones)
+    if not bones:
+        raise ValueError("Couldn't find any bone to bind to.")
+    starts, ends, owners = get_bone_segments(bones)
+    first_segments = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+
+    skinclusters = []
+    for mesh in cmds.ls(meshes):
+        skc = bind_skincluster(mesh, bones, maximumInfluences=1)
+        cmds.setAttr(skc + ".maxInfluences", max_influences)
+
+        distances = bgdev.utils.spatial.segment_distances(
+            bgdev.utils.mesh.get_points(mesh), starts, ends
+        )
+        distances = np.minimum.reduceat(distances, first_segments, axis=1)
+        weights = bgdev.utils.weightarray.from_distances(
+            distances, falloff, max_influences, threshold=0.001
+        )
+
+        influences = bgdev.api.skincluster.get_influences(skc)
+        columns = bgdev.utils.weightarray.get_columns(influences, bones)
+        array = np.zeros((len(weights), len(influences)))
+        array[:, columns] = weights
+        set_weights(skc, array)
+        skinclusters.append(skc)
+
+    return skinclusters
+
+
+def get_bone_segments(bones):
+    """Get the world space segments going from each bone to its children.
+
+    Bones without child joint are a single point.
+
+    Args:
+        bones (list): List of bones.
+
+    Returns:
+        tuple: The ``(segments x 3)`` start and end positions and the
+        index of the bone each segment belongs to, in increasing order.
+    """
+    starts, ends, owners = [], [], []
+    for index, bone in enumerate(bones):
+        start = cmds.xform(bone, query=True, worldSpace=True, translation=True)
+        children = cmds.listRelatives(
+            bone, children=True, type="joint", fullPath=True
+        )
+        for child in children or [bone]:
+            starts.append(start)
+            ends.append(
+                cmds.xform(
+                    child, query=True, worldSpace=True, translation=True
+                )
+            )
+            owners.append(index)
+    return np.array(starts), np.array(ends), np.array(owners)
+
+
 @bgdev.utils.decorator.UNDO_REPEAT
-def copy_skincluster_callback(method="closestPoint"):
-    """Call back :func:`copy_skincluster`."""
+def copy_skincluster_callback(method="closestPoint", uv_set=None):
+    """Call back :func:`copy_skincluster`.
+
+    The "closestPoint" and "uv" methods can't be undone on targets which
+    already have a skincluster, their previous weights are kept with
+    :func:`keep_weights` instead.
+    """
     selection = cmds.ls(selection=True)
     if not selection:
         LOG.warning("Please select at least 2 nodes!")
         return
 
     source, targets = selection[0], selection[1:]
+    transfer = None
+    if method in WeightTransfer.METHODS:
+        transfer = WeightTransfer(source, method, uv_set=uv_set)
     for target in targets:
-        copy_skincluster(source, target, method)
+        if transfer:
+            keep_weights(target)
+        copy_skincluster(
+            source, target, method, transfer=transfer, uv_set=uv_set
+        )
 
     cmds.select(selection)
 
 
-def copy_skincluster(source, target, method="closestPoint"):
+def copy_skincluster(  # pylint: disable=too-many-arguments
+    source, target, method="closestPoint", transfer=None, uv_set=None
+):
     """Copy source skincluster onto target and keep same weights.
 
+    The "closestPoint" and "uv" methods interpolate the weights of the
+    closest source triangle in NumPy, reading and writing all the weights at
+    once. Other methods fall back on `cmds.copySkinWeights`.
+
+    Unlike `cmds.copySkinWeights`, the NumPy methods match the influences by
+    name, as the target gets all the source influences, and don't smooth
+    the result. Their weights are written with `MFnSkinCluster.setWeights`
+    which can't be undone, see :func:`keep_weights`.
+
     Args:
         source (str): source mesh to copy skincluster form
         target (str): target mesh to paste skincluster to
-        method (str): influence association method. Default is closestPoint.
+        method (str): surface association method. Default is closestPoint.
+        transfer (WeightTransfer): Prebuilt source transfer to reuse when
+            copying the same source onto several targets.
+        uv_set (str): Name of the uv set used by the "uv" method, on both
+            meshes. Use their current one if None.
 
     Raises:
         RuntimeError: If the source skincluster cannot be found.
@@ -320,16 +922,111 @@ def copy_skincluster(source, target, method="closestPoint"):
             cmds.skinCluster(target_skc, edit=True, addInfluence=infs_objects)
 
     # copy skincluster weights
-    if method == "uv":
-        copy_settings["uvSpace"] = ["map1", "map1"]
-    else:
-        copy_settings["surfaceAssociation"] = method
+    if method in WeightTransfer.METHODS:
+        transfer = transfer or WeightTransfer(source, method, uv_set)
+        transfer.apply(target_skc, target)
+        return
+
+    copy_settings["surfaceAssociation"] = method
 
     cmds.copySkinWeights(
         sourceSkin=source_skc, destinationSkin=target_skc, **copy_settings
     )
 
 
+class WeightTransfer(object):
+    """Source skin weights ready to be transferred onto many targets.
+
+    The source weights and the spatial index of its triangles are computed
+    once, so copying a skincluster onto several targets only pays for the
+    lookups of each target.
+
+    Args:
+        source (str): The skinned source mesh.
+        method (str): The surface association method, either
+            "closestPoint" or "uv".
+        uv_set (str): Name of the uv set of the "uv" method.
+            Use the current one if None.
+
+    Raises:
+        ValueError: If the method isn't supported.
+        RuntimeError: If the source skincluster cannot be found.
+    """
+
+    METHODS = ("closestPoint", "uv")
+
+    def __init__(self, source, method="closestPoint", uv_set=None):
+        if method not in self.METHODS:
+            raise ValueError("Unknown transfer method: {}".format(method))
+        self.method = method
+        self.uv_set = uv_set
+        self.skincluster = get_skincluster(source)
+        if not self.skincluster:
+            raise RuntimeError("Couldn't find a source skincluster.")
+
+        self.influences = bgdev.api.skincluster.get_influences(
+            self.skincluster
+        )
+        self.weights = get_weights(self.skincluster)
+
+        triangles = bgdev.utils.mesh.get_triangles(source)
+        if method == "uv":
+            uvs, uv_triangles = bgdev.utils.mesh.get_uv_triangles(
+                source, uv_set
+            )
+            mapped = np.all(uv_triangles >= 0, axis=1)
+            self.index = bgdev.utils.spatial.UVIndex(
+                uvs, uv_triangles[mapped], triangles[mapped]
+            )
+        else:
+            self.index = bgdev.utils.spatial.TriangleIndex(
+                bgdev.utils.mesh.get_points(source), triangles
+            )
+
+    def get_weights(self, target):
+        """Get the source weights interpolated on the target vertices.
+
+        Args:
+            target (str): Name of the target mesh.
+
+        Returns:
+            numpy.ndarray: The ``(target vertices x source influences)``
+            weight array.
+        """
+        if self.method == "uv":
+            points = bgdev.utils.mesh.get_vertex_uvs(target, self.uv_set)
+            missing = np.isnan(points[:, 0])
+            if missing.any():
+                LOG.warning(
+                    "%s vertices without UVs on %r.", missing.sum(), target
+                )
+            points = np.nan_to_num(points)
+        else:
+            points = bgdev.utils.mesh.get_points(target)
+        return self.index.transfer(self.weights, points)
+
+    def apply(self, skincluster, target):
+        """Set the transferred weights on the target skincluster.
+
+        The weights are written with `MFnSkinCluster.setWeights`, which
+        Undo doesn't revert, capture them with :func:`keep_weights` first.
+
+        Args:
+            skincluster (str): The target skincluster. It must already have
+                all the source influences.
+            target (str): Name of the target mesh.
+        """
+        influences = bgdev.api.skincluster.get_influences(skincluster)
+        columns = bgdev.utils.weightarray.get_columns(
+            influences, self.influences
+        )
+        weights = self.get_weights(target)
+        array = np.zeros((len(weights), len(influences)))
+        array[:, columns] = weights
+        array = bgdev.utils.weightarray.normalize(array)
+        set_weights(skincluster, array)
+
+
 @bgdev.utils.decorator.UNDO_REPEAT
 def reset_skincluster_callback():
     """Call back :func:`reset_skincluster`."""
@@ -338,41 +1035,42 @@ def reset_skincluster_callback():
         LOG.warning("Please select at least 1 node!")
         return
 
-    for each in selection:
-        reset_skincluster(each)
+    reset_skincluster(selection)
 
 
-def reset_skincluster(node):
-    """Reset the skin cluster in place.
+def reset_skincluster(nodes):
+    """Reset the skin clusters in place.
+
+    The bindPreMatrix of each influence is set with `cmds.setAttr` so the
+    reset can be undone, then the bind matrices of each skincluster are
+    recached and its dagPoses reset once.
 
     Args:
-        node (str): SkinCluster node or the geometry bound to it.
+        nodes (list): SkinCluster nodes or the geometries bound to them.
 
     """
-    # get skinclusters
-    skincluster = node
-    if cmds.nodeType(node) != "skinCluster":
-        skincluster = mel.eval("findRelatedSkinCluster {0}".format(node))
-
-    # detach skinclusters
-    influences = cmds.skinCluster(skincluster, query=True, influence=True)
-    for i, influence in enumerate(influences):
-
-        # reset bindPreMatrix for each joints
-        matrix = cmds.getAttr(influence + ".worldInverseMatrix")
-        cmds.setAttr(
-            "{0}.bindPreMatrix[{1}]".format(skincluster, i),
-            matrix,
-            type="matrix",
-        )
+    skinclusters = []
+    for node in cmds.ls(nodes):
+        skincluster = get_skincluster(node)
+        if not skincluster:
+            LOG.warning("Couldn't find a skincluster onto %s.", node)
+        elif skincluster not in skinclusters:
+            skinclusters.append(skincluster)
+
+    for skincluster in skinclusters:
+        matrices = bgdev.api.skincluster.get_bind_matrices(skincluster)
+        for index, matrix in sorted(matrices.items()):
+            plug = "{}.bindPreMatrix[{}]".format(skincluster, index)
+            cmds.setAttr(plug, matrix, type="matrix")
         cmds.skinCluster(skincluster, edit=True, recacheBindMatrices=True)
 
         # reset dagPose
+        influences = bgdev.api.skincluster.get_influences(skincluster)
         dag_poses = cmds.listConnections(
             skincluster, source=True, type="dagPose"
         )
-        for each in dag_poses:
-            cmds.dagPose(influence, reset=True, name=each)
+        for each in set(dag_poses or []):
+            cmds.dagPose(influences, reset=True, name=each)
 
 
 @bgdev.utils.decorator.UNDO_REPEAT
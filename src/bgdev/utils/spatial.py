@@ -0,0 +1,624 @@
+"""Vectorized geometry helpers to transfer data between meshes.
+
+Like :mod:`bgdev.utils.weightarray`, this module doesn't need Maya.
+
+:created: 17/10/2026
+:author: Benoit Gielly <benoit.gielly@gmail.com>
+"""
+from __future__ import absolute_import, division
+
+import numpy as np
+
+
+def barycentric(points, corners):
+    """Get the barycentric coordinates of points in their triangle.
+
+    Points outside of their triangle get coordinates outside of [0, 1],
+    use :func:`clamp_barycentric` to snap them back on the triangle.
+
+    Args:
+        points (numpy.ndarray): The ``(N x D)`` points, in 2D or 3D.
+        corners (numpy.ndarray): The ``(N x 3 x D)`` triangle of each point.
+
+    Returns:
+        numpy.ndarray: The ``(N x 3)`` barycentric coordinates.
+    """
+    corner_a = corners[:, 0]
+    edge_ab = corners[:, 1] - corner_a
+    edge_ac = corners[:, 2] - corner_a
+    vector = points - corner_a
+
+    d00 = np.einsum("ij,ij->i", edge_ab, edge_ab)
+    d01 = np.einsum("ij,ij->i", edge_ab, edge_ac)
+    d11 = np.einsum("ij,ij->i", edge_ac, edge_ac)
+    d20 = np.einsum("ij,ij->i", vector, edge_ab)
+    d21 = np.einsum("ij,ij->i", vector, edge_ac)
+    denominator = d00 * d11 - d01 * d01
+
+    # degenerated triangles get all the weight on their first corner
+    valid = np.abs(denominator) > 1e-12
+    denominator = np.where(valid, denominator, 1.0)
+    coord_v = np.where(valid, (d11 * d20 - d01 * d21) / denominator, 0.0)
+    coord_w = np.where(valid, (d00 * d21 - d01 * d20) / denominator, 0.0)
+    return np.column_stack([1.0 - coord_v - coord_w, coord_v, coord_w])
+
+
+def clamp_barycentric(coords):
+    """Clamp barycentric coordinates onto their triangle.
+
+    Args:
+        coords (numpy.ndarray): The ``(N x 3)`` barycentric coordinates.
+
+    Returns:
+        numpy.ndarray: The clamped coordinates, summing to 1.0.
+    """
+    coords = np.clip(coords, 0.0, None)
+    totals = coords.sum(axis=1, keepdims=True)
+    coords = np.divide(
+        coords, totals, out=np.zeros_like(coords), where=totals > 0
+    )
+    coords[totals[:, 0] <= 0, 0] = 1.0
+    return coords
+
+
+def interpolate(values, triangles, coords):
+    """Blend per-vertex values using barycentric coordinates.
+
+    Args:
+        values (numpy.ndarray): The ``(vertices x N)`` values to blend.
+        triangles (numpy.ndarray): The ``(M x 3)`` vertex indices of the
+            triangle each result is blended from.
+        coords (numpy.ndarray): The ``(M x 3)`` barycentric coordinates.
+
+    Returns:
+        numpy.ndarray: The ``(M x N)`` blended values.
+    """
+    result = values[triangles[:, 0]] * coords[:, 0, None]
+    result += values[triangles[:, 1]] * coords[:, 1, None]
+    result += values[triangles[:, 2]] * coords[:, 2, None]
+    return result
+
+
+def segment_distances(points, starts, ends, chunk_size=2**22):
+    """Get the distance of each point to each segment.
+
+    Args:
+        points (numpy.ndarray): The ``(N x 3)`` points.
+        starts (numpy.ndarray): The ``(M x 3)`` first end of each segment.
+        ends (numpy.ndarray): The ``(M x 3)`` other end of each segment.
+            Segments with both ends at the same position are points.
+        chunk_size (int): Maximum amount of point-segment pairs computed at
+            once, to keep the memory in check on large meshes.
+
+    Returns:
+        numpy.ndarray: The ``(N x M)`` distances.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    vectors = np.asarray(ends, dtype=np.float64).reshape(-1, 3) - starts
+    lengths = np.einsum("ij,ij->i", vectors, vectors)
+    lengths[lengths == 0] = 1.0
+
+    result = np.empty((len(points), len(starts)))
+    step = max(1, chunk_size // max(1, len(starts)))
+    for start in range(0, len(points), step):
+        chunk = slice(start, start + step)
+        delta = points[chunk, None, :] - starts[None, :, :]
+        ratio = np.clip(
+            np.einsum("ijk,jk->ij", delta, vectors) / lengths, 0, 1
+        )
+        delta -= ratio[:, :, None] * vectors[None, :, :]
+        result[chunk] = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+    return result
+
+
+def match_points(points, targets, tolerance=1e-3):
+    """Find, for each target, a point at the same position.
+
+    The points are stored in a spatial hash with cells the size of the
+    tolerance, so each target only looks at the 27 cells around it.
+
+    Args:
+        points (numpy.ndarray): The ``(N x 3)`` points to match.
+        targets (numpy.ndarray): The ``(M x 3)`` positions to look for.
+        tolerance (float): Maximum distance between matching positions.
+
+    Returns:
+        numpy.ndarray: The ``(M,)`` index of the closest point within the
+        tolerance of each target, -1 if there is none.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+    matches = np.full(len(targets), -1, dtype=np.int64)
+    distances = np.full(len(targets), tolerance**2)
+    if not len(points) or not len(targets):
+        return matches
+
+    origin = points.min(axis=0)
+    keys = hash_cells(np.floor((points - origin) / tolerance))
+    point_ids = np.argsort(keys, kind="stable")
+    keys = keys[point_ids]
+
+    cells = np.floor((targets - origin) / tolerance)
+    for offset in get_ring_offsets(1).tolist() + [[0, 0, 0]]:
+        lookup = hash_cells(cells + offset)
+        starts = np.searchsorted(keys, lookup, side="left")
+        counts = np.searchsorted(keys, lookup, side="right") - starts
+        queries = np.repeat(np.arange(len(targets)), counts)
+        local = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        candidates = point_ids[np.repeat(starts, counts) + local]
+
+        # hash collisions are discarded by the distance test
+        delta = targets[queries] - points[candidates]
+        found = np.einsum("ij,ij->i", delta, delta)
+        order = np.lexsort([found, queries])
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = queries[order][1:] != queries[order][:-1]
+        order = order[first]
+        queries = queries[order]
+        closer = found[order] <= distances[queries]
+        queries, order = queries[closer], order[closer]
+        distances[queries] = found[order]
+        matches[queries] = candidates[order]
+    return matches
+
+
+def hash_cells(cells):
+    """Hash integer cell coordinates into a single int64 key.
+
+    Uses the large primes of "Optimized Spatial Hashing for Collision
+    Detection of Deformable Objects" (Teschner et al.), overflowing
+    integers simply wrap around.
+    """
+    cells = np.asarray(cells).astype(np.int64)
+    return (
+        cells[:, 0] * np.int64(73856093)
+        ^ cells[:, 1] * np.int64(19349663)
+        ^ cells[:, 2] * np.int64(83492791)
+    )
+
+
+def closest_point_on_triangles(points, corners):
+    """Get the closest point of each point on its triangle.
+
+    Vectorized version of the region tests from "Real-Time Collision
+    Detection" (Christer Ericson, 5.1.5).
+
+    Args:
+        points (numpy.ndarray): The ``(N x 3)`` points.
+        corners (numpy.ndarray): The ``(N x 3 x 3)`` triangle of each point.
+
+    Returns:
+        tuple: The ``(N x 3)`` barycentric coordinates of the closest points
+        and the ``(N,)`` squared distances to them.
+    """
+    corner_a, corner_b, corner_c = corners[:, 0], corners[:, 1], corners[:, 2]
+    edge_ab = corner_b - corner_a
+    edge_ac = corner_c - corner_a
+
+    def dot(vec1, vec2):
+        return np.einsum("ij,ij->i", vec1, vec2)
+
+    vector = points - corner_a
+    d_1, d_2 = dot(edge_ab, vector), dot(edge_ac, vector)
+    vector = points - corner_b
+    d_3, d_4 = dot(edge_ab, vector), dot(edge_ac, vector)
+    vector = points - corner_c
+    d_5, d_6 = dot(edge_ab, vector), dot(edge_ac, vector)
+    v_a = d_3 * d_6 - d_5 * d_4
+    v_b = d_5 * d_2 - d_1 * d_6
+    v_c = d_1 * d_4 - d_3 * d_2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = v_a + v_b + v_c
+        coords = np.column_stack([v_a, v_b, v_c]) / total[:, None]
+        edge_ab_v = d_1 / (d_1 - d_3)
+        edge_ac_w = d_2 / (d_2 - d_6)
+        edge_bc_w = (d_4 - d_3) / ((d_4 - d_3) + (d_5 - d_6))
+
+    # from the least to the most important region, the last one wins
+    regions = [
+        (
+            (v_a <= 0) & (d_4 - d_3 >= 0) & (d_5 - d_6 >= 0),
+            [0.0, 1.0 - edge_bc_w, edge_bc_w],
+        ),
+        (
+            (v_b <= 0) & (d_2 >= 0) & (d_6 <= 0),
+            [1.0 - edge_ac_w, 0.0, edge_ac_w],
+        ),
+        ((d_6 >= 0) & (d_5 <= d_6), [0.0, 0.0, 1.0]),
+        (
+            (v_c <= 0) & (d_1 >= 0) & (d_3 <= 0),
+            [1.0 - edge_ab_v, edge_ab_v, 0.0],
+        ),
+        ((d_3 >= 0) & (d_4 <= d_3), [0.0, 1.0, 0.0]),
+        ((d_1 <= 0) & (d_2 <= 0), [1.0, 0.0, 0.0]),
+    ]
+    for mask, values in regions:
+        for axis, value in enumerate(values):
+            value = value[mask] if np.ndim(value) else value
+            coords[mask, axis] = value
+
+    # degenerated triangles can still end up without valid coordinates
+    invalid = ~np.all(np.isfinite(coords), axis=1)
+    coords[invalid] = [1.0, 0.0, 0.0]
+
+    closest = np.einsum("ij,ijk->ik", coords, corners)
+    delta = points - closest
+    return coords, dot(delta, delta)
+
+
+class TriangleIndex(object):
+    """Uniform grid over the triangles of a mesh to find closest points.
+
+    The grid is built once and can then project any amount of points, which
+    makes transferring data from one mesh onto many targets cheap.
+
+    Args:
+        points (numpy.ndarray): The ``(vertices x 3)`` mesh points.
+        triangles (numpy.ndarray): The ``(triangles x 3)`` vertex indices.
+        cell_size (float): Size of the grid cells. Defaults to the average
+            size of the triangles.
+
+    Example:
+        ::
+
+            index = TriangleIndex(points, triangles)
+            for target_points in targets:
+                weights = index.transfer(source_weights, target_points)
+
+    """
+
+    OFFSET = 2**19
+    MAX_RINGS = 2
+    CHUNK_SIZE = 4096
+    CLUSTER_SIZE = 8
+
+    def __init__(self, points, triangles, cell_size=None):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.corners = self.points[self.triangles]
+        self.centers = self.corners.mean(axis=1)
+        self.radii = np.linalg.norm(
+            self.corners - self.centers[:, None], axis=2
+        ).max(axis=1)
+
+        lower = self.corners.min(axis=1)
+        upper = self.corners.max(axis=1)
+        if cell_size is None:
+            sizes = (upper - lower).max(axis=1)
+            cell_size = float(sizes.mean()) if len(sizes) else 1.0
+        self.cell_size = max(cell_size, 1e-6)
+        self.origin = lower.min(axis=0) if len(lower) else np.zeros(3)
+
+        # register each triangle in every cell its bounding box overlaps
+        lower = self.get_cells(lower)
+        upper = self.get_cells(upper)
+        spans = upper - lower + 1
+        counts = spans.prod(axis=1)
+        triangle_ids = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        spans = spans[triangle_ids]
+        cells = lower[triangle_ids] + np.column_stack(
+            [
+                local // (spans[:, 1] * spans[:, 2]),
+                local // spans[:, 2] % spans[:, 1],
+                local % spans[:, 2],
+            ]
+        )
+
+        keys = self.get_keys(cells)
+        order = np.argsort(keys, kind="stable")
+        self.triangle_ids = triangle_ids[order]
+        self.keys, self.starts, self.counts = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+        self.lower = cells.min(axis=0) if len(cells) else np.zeros(3, int)
+        self.upper = cells.max(axis=0) if len(cells) else np.zeros(3, int)
+
+        # group triangles in coarse clusters to prune far queries quickly
+        keys = self.get_keys(self.get_cells(self.centers) // self.CLUSTER_SIZE)
+        self.cluster_order = np.argsort(keys, kind="stable")
+        _, self.cluster_starts, self.cluster_counts = np.unique(
+            keys[self.cluster_order], return_index=True, return_counts=True
+        )
+        groups = np.repeat(
+            np.arange(len(self.cluster_counts)), self.cluster_counts
+        )
+        centers = self.centers[self.cluster_order]
+        self.cluster_centers = np.zeros((len(self.cluster_counts), 3))
+        np.add.at(self.cluster_centers, groups, centers)
+        self.cluster_centers /= self.cluster_counts[:, None]
+        offsets = np.linalg.norm(
+            centers - self.cluster_centers[groups], axis=1
+        )
+        self.cluster_radii = np.zeros(len(self.cluster_counts))
+        np.maximum.at(
+            self.cluster_radii,
+            groups,
+            offsets + self.radii[self.cluster_order],
+        )
+
+    def get_cells(self, points):
+        """Get the grid cell coordinates of given points."""
+        cells = np.floor((points - self.origin) / self.cell_size)
+        return np.clip(cells, -self.OFFSET, self.OFFSET - 1).astype(np.int64)
+
+    def get_keys(self, cells):
+        """Get a unique integer key for each cell coordinates."""
+        cells = cells + self.OFFSET
+        size = 2 * self.OFFSET
+        return (cells[:, 0] * size + cells[:, 1]) * size + cells[:, 2]
+
+    def get_candidates(self, cells, offset):
+        """Get the triangles registered in the offset cell of each cell.
+
+        Returns:
+            tuple: The index of the query and the triangle of each pair.
+        """
+        keys = self.get_keys(cells + offset)
+        index = np.searchsorted(self.keys, keys)
+        index = np.minimum(index, len(self.keys) - 1)
+        found = self.keys[index] == keys
+        queries = np.flatnonzero(found)
+        starts = self.starts[index[found]]
+        counts = self.counts[index[found]]
+        local = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        slots = np.repeat(starts, counts) + local
+        return np.repeat(queries, counts), self.triangle_ids[slots]
+
+    def update_best(self, points, queries, triangles, best):
+        """Keep the closest of the given candidate triangles per query."""
+        if not len(queries):  # pylint: disable=len-as-condition
+            return
+        coords, distances = closest_point_on_triangles(
+            points[queries], self.corners[triangles]
+        )
+        order = np.lexsort([distances, queries])
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = queries[order][1:] != queries[order][:-1]
+        order = order[first]
+        queries = queries[order]
+        closer = distances[order] < best["distances"][queries]
+        queries, order = queries[closer], order[closer]
+        best["distances"][queries] = distances[order]
+        best["faces"][queries] = triangles[order]
+        best["coords"][queries] = coords[order]
+
+    def closest(self, points):
+        """Find the closest point on the mesh for each given point.
+
+        Args:
+            points (numpy.ndarray): The ``(N x 3)`` points to project.
+
+        Returns:
+            tuple: The ``(N,)`` closest triangle indices, their ``(N x 3)``
+            barycentric coordinates and the ``(N,)`` squared distances.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        faces = np.zeros(len(points), dtype=np.int64)
+        coords = np.zeros((len(points), 3))
+        distances = np.full(len(points), np.inf)
+        if not len(self.triangles):  # pylint: disable=len-as-condition
+            return faces, coords, distances
+
+        for start in range(0, len(points), self.CHUNK_SIZE):
+            chunk = slice(start, start + self.CHUNK_SIZE)
+            best = {
+                "faces": faces[chunk],
+                "coords": coords[chunk],
+                "distances": distances[chunk],
+            }
+            self.closest_chunk(points[chunk], best)
+        return faces, coords, distances
+
+    def closest_chunk(self, points, best):
+        """Fill the closest triangles of a chunk of points in ``best``."""
+        cells = self.get_cells(points)
+        pending = np.arange(len(points))
+
+        # search the cells ring by ring around each point
+        near = np.all(
+            (cells >= self.lower - self.MAX_RINGS)
+            & (cells <= self.upper + self.MAX_RINGS),
+            axis=1,
+        )
+        pending = pending[near]
+        for ring in range(self.MAX_RINGS + 1):
+            if not len(pending):  # pylint: disable=len-as-condition
+                break
+            for offset in get_ring_offsets(ring):
+                queries, triangles = self.get_candidates(
+                    cells[pending], offset
+                )
+                self.update_best(points, pending[queries], triangles, best)
+            # anything outside the searched rings is further than this
+            radius = ring * self.cell_size
+            pending = pending[best["distances"][pending] > radius**2]
+
+        # points far from the grid cells fall back to bounding spheres
+        pending = np.union1d(pending, np.flatnonzero(~near))
+        step = max(1, self.CHUNK_SIZE * 256 // len(self.cluster_counts))
+        for start in range(0, len(pending), step):
+            self.closest_far(points, pending[start : start + step], best)
+
+    def closest_far(self, points, pending, best):
+        """Find the closest triangles using bounding spheres.
+
+        Nothing in a sphere can be closer than its center distance minus its
+        radius, nor further than its center distance plus its radius. So the
+        clusters, then the triangles, which can't beat the best upper bound
+        are skipped before testing the remaining ones.
+        """
+        upper = np.sqrt(best["distances"][pending])
+        queries, clusters = prune_spheres(
+            points[pending],
+            np.arange(len(pending)),
+            self.cluster_centers,
+            self.cluster_radii,
+            upper,
+        )
+
+        counts = self.cluster_counts[clusters]
+        local = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        slots = np.repeat(self.cluster_starts[clusters], counts) + local
+        queries = np.repeat(queries, counts)
+        triangles = self.cluster_order[slots]
+
+        keep = prune_spheres(
+            points[pending],
+            queries,
+            self.centers,
+            self.radii,
+            upper,
+            triangles,
+        )
+        self.update_best(points, pending[queries[keep]], triangles[keep], best)
+
+    def transfer(self, values, points):
+        """Interpolate per-vertex values of the mesh at given points.
+
+        Args:
+            values (numpy.ndarray): The ``(vertices x N)`` values to transfer.
+            points (numpy.ndarray): The ``(M x 3)`` points to transfer to.
+
+        Returns:
+            numpy.ndarray: The ``(M x N)`` interpolated values.
+        """
+        faces, coords, _ = self.closest(points)
+        return interpolate(values, self.triangles[faces], coords)
+
+
+class UVIndex(TriangleIndex):
+    """Bucket grid over UV triangles to locate points in UV space.
+
+    Each point is first looked up in the triangles of its own cell, only
+    points outside of every UV shell fall back on the closest triangle.
+
+    Args:
+        uvs (numpy.ndarray): The ``(uvs x 2)`` coordinates.
+        uv_triangles (numpy.ndarray): The ``(triangles x 3)`` uv ids.
+        triangles (numpy.ndarray): The ``(triangles x 3)`` vertex ids of the
+            same triangles, used to interpolate per-vertex values.
+            Use the uv ids if None.
+        cell_size (float): Size of the grid cells. Defaults to the average
+            size of the triangles.
+
+    """
+
+    def __init__(self, uvs, uv_triangles, triangles=None, cell_size=None):
+        super(UVIndex, self).__init__(
+            to_3d(uvs), uv_triangles, cell_size=cell_size
+        )
+        if triangles is None:
+            triangles = self.triangles
+        self.vertex_triangles = np.asarray(triangles, np.int64).reshape(-1, 3)
+
+    def closest(self, points):
+        """Find the UV triangle containing each given point.
+
+        Args:
+            points (numpy.ndarray): The ``(N x 2)`` uv coordinates.
+
+        Returns:
+            tuple: The ``(N,)`` triangle indices, their ``(N x 3)``
+            barycentric coordinates and the ``(N,)`` squared distances,
+            which are 0.0 for points inside a triangle.
+        """
+        points = to_3d(points)
+        faces = np.zeros(len(points), dtype=np.int64)
+        coords = np.zeros((len(points), 3))
+        distances = np.zeros(len(points))
+        if not len(self.triangles):  # pylint: disable=len-as-condition
+            return faces, coords, np.full(len(points), np.inf)
+
+        queries, triangles = self.get_candidates(
+            self.get_cells(points), np.zeros(3, dtype=np.int64)
+        )
+        found = barycentric(
+            points[queries, :2], self.corners[triangles][:, :, :2]
+        )
+        inside = np.all(found >= -1e-9, axis=1)
+        queries, first = np.unique(queries[inside], return_index=True)
+        faces[queries] = triangles[inside][first]
+        coords[queries] = clamp_barycentric(found[inside][first])
+
+        pending = np.ones(len(points), dtype=bool)
+        pending[queries] = False
+        if pending.any():
+            closest = super(UVIndex, self).closest(points[pending])
+            faces[pending], coords[pending], distances[pending] = closest
+        return faces, coords, distances
+
+    def transfer(self, values, points):
+        """Interpolate per-vertex values of the mesh at given uvs.
+
+        Args:
+            values (numpy.ndarray): The ``(vertices x N)`` values to transfer.
+            points (numpy.ndarray): The ``(M x 2)`` uvs to transfer to.
+
+        Returns:
+            numpy.ndarray: The ``(M x N)`` interpolated values.
+        """
+        faces, coords, _ = self.closest(points)
+        return interpolate(values, self.vertex_triangles[faces], coords)
+
+
+def prune_spheres(points, queries, centers, radii, upper, spheres=None):
+    """Skip the spheres which can't contain the closest point of a query.
+
+    Args:
+        points (numpy.ndarray): The ``(N x 3)`` query points.
+        queries (numpy.ndarray): The query index of each pair to test.
+        centers (numpy.ndarray): The ``(M x 3)`` sphere centers.
+        radii (numpy.ndarray): The ``(M,)`` sphere radii.
+        upper (numpy.ndarray): The ``(N,)`` known closest distances,
+            updated in place with the sphere bounds.
+        spheres (numpy.ndarray): The sphere index of each pair to test.
+            Test each query against all the spheres if None.
+
+    Returns:
+        tuple: The query and sphere indices of the kept pairs if
+        ``spheres`` is None, the mask of the kept pairs otherwise.
+    """
+    if spheres is None:
+        delta = points[queries, None, :] - centers[None, :, :]
+        distances = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+        bound = (distances + radii).min(axis=1)
+        np.minimum(upper, bound, out=upper)
+        return np.nonzero(distances - radii <= upper[:, None])
+
+    delta = points[queries] - centers[spheres]
+    distances = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    np.minimum.at(upper, queries, distances + radii[spheres])
+    return distances - radii[spheres] <= upper[queries]
+
+
+def to_3d(points):
+    """Pad 2D points with a zero Z coordinate."""
+    points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+    result = np.zeros((len(points), 3))
+    result[:, : points.shape[1]] = points
+    return result
+
+
+def get_ring_offsets(ring):
+    """Get the cell offsets at given distance (in cells) of a center cell.
+
+    Args:
+        ring (int): The distance, in cells, from the center cell.
+
+    Returns:
+        numpy.ndarray: The ``(N x 3)`` offsets of the cells on the ring.
+    """
+    steps = np.arange(-ring, ring + 1)
+    offsets = np.stack(np.meshgrid(steps, steps, steps), -1).reshape(-1, 3)
+    return offsets[np.abs(offsets).max(axis=1) == ring]
@@ -0,0 +1,348 @@
+"""Array core for skin weights.
+
+Every function in this module works on dense ``(vertices x influences)``
+NumPy arrays and never touches Maya, so the skincluster and weightmap tools
+can share the same fast path and it can be checked from any interpreter.
+
+:created: 17/10/2026
+:author: Benoit Gielly <benoit.gielly@gmail.com>
+"""
+from __future__ import absolute_import, division
+
+import hashlib
+
+import numpy as np
+
+DTYPE = np.float64
+
+
+def from_flat(values, influence_count):
+    """Reshape a flat list of weights into a dense weight array.
+
+    Args:
+        values (list): Flat weights, ordered per vertex then per influence.
+        influence_count (int): Amount of influences (columns).
+
+    Returns:
+        numpy.ndarray: The ``(vertices x influences)`` weight array.
+    """
+    if not isinstance(values, np.ndarray):
+        values = np.fromiter(values, dtype=DTYPE, count=len(values))
+    values = values.astype(DTYPE, copy=False)
+    if not influence_count:
+        return values.reshape(-1, 0)
+    return values.reshape(-1, influence_count)
+
+
+def to_flat(array):
+    """Flatten a dense weight array, vertex-major, as expected by Maya.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+
+    Returns:
+        numpy.ndarray: The contiguous 1D float64 array.
+    """
+    return np.ascontiguousarray(array, dtype=DTYPE).ravel()
+
+
+def get_columns(influences, names):
+    """Get the column indices of given names in the influences list.
+
+    Args:
+        influences (list): Ordered influence names (the array columns).
+        names (list): Names to look for.
+
+    Raises:
+        ValueError: If any of the names isn't part of the influences.
+
+    Returns:
+        list: The column index of each name.
+    """
+    lookup = {x: i for i, x in enumerate(influences)}
+    missing = [x for x in names if x not in lookup]
+    if missing:
+        raise ValueError("Influences not found: {}".format(missing))
+    return [lookup[x] for x in names]
+
+
+def check_shape(array, rows=None, columns=None):
+    """Make sure given array is 2D and has the expected shape.
+
+    Args:
+        array (numpy.ndarray): The weight array to check.
+        rows (int): Expected amount of vertices, if any.
+        columns (int): Expected amount of influences, if any.
+
+    Raises:
+        ValueError: If the array doesn't have the expected shape.
+
+    Returns:
+        numpy.ndarray: The array as float64.
+    """
+    array = np.asarray(array, dtype=DTYPE)
+    if array.ndim != 2:
+        raise ValueError("Expected a 2D array, got {}D.".format(array.ndim))
+    if rows is not None and array.shape[0] != rows:
+        msg = "Expected {} vertices, got {}.".format(rows, array.shape[0])
+        raise ValueError(msg)
+    if columns is not None and array.shape[1] != columns:
+        msg = "Expected {} influences, got {}.".format(columns, array.shape[1])
+        raise ValueError(msg)
+    return array
+
+
+def normalize(array, locked=None):
+    """Normalize each row of the weight array so it sums to 1.0.
+
+    Rows without any weight are left untouched. Weights of locked influences
+    are kept and only the unlocked weights are rescaled to fill the rest.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        locked (list): Column indices of the locked influences.
+
+    Returns:
+        numpy.ndarray: A normalized copy of the array.
+    """
+    array = np.array(array, dtype=DTYPE)
+    free = np.ones(array.shape[1], dtype=bool)
+    if locked is not None:
+        free[list(locked)] = False
+
+    totals = array[:, free].sum(axis=1)
+    targets = np.clip(1.0 - array[:, ~free].sum(axis=1), 0.0, None)
+    scale = np.divide(
+        targets, totals, out=np.ones_like(totals), where=totals > 0
+    )
+    array[:, free] *= scale[:, None]
+    return array
+
+
+def hash_arrays(*arrays):
+    """Hash the content of given arrays.
+
+    The dtype and shape of each array are part of the hash, so the same
+    bytes interpreted differently don't collide.
+
+    Args:
+        arrays (numpy.ndarray): The arrays to hash.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update("{}{}".format(array.dtype.str, array.shape).encode())
+        digest.update(array.view(np.uint8).ravel())
+    return digest.hexdigest()
+
+
+def prune(array, max_influences=None, threshold=0.0, locked=None):
+    """Cap the influences per vertex and remove tiny weights.
+
+    Only the ``max_influences`` highest weights of each vertex are kept,
+    then weights below ``threshold`` are removed and the remaining ones
+    renormalized. Weights of locked influences are never changed but still
+    count towards the cap, so only the unlocked weights are rescaled.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        max_influences (int): Maximum amount of influences per vertex.
+            Don't cap the influences if None.
+        threshold (float): Remove weights below this value.
+        locked (list): Column indices of the locked influences.
+
+    Returns:
+        numpy.ndarray: A pruned copy of the array.
+    """
+    array = np.array(array, dtype=DTYPE)
+    free = np.ones(array.shape[1], dtype=bool)
+    if locked is not None:
+        free[list(locked)] = False
+
+    remove = np.zeros(array.shape, dtype=bool)
+    if max_influences and array.shape[1] > max_influences:
+        # locked weights get the first slots, unweighted ones the last
+        score = np.where(free, array, np.where(array > 0, np.inf, -np.inf))
+        top = np.argpartition(-score, max_influences - 1, axis=1)
+        remove = np.ones(array.shape, dtype=bool)
+        np.put_along_axis(remove, top[:, :max_influences], False, axis=1)
+    if threshold:
+        remove |= array < threshold
+    array[remove & free] = 0.0
+    return normalize(array, locked)
+
+
+def from_distances(distances, falloff=4.0, max_influences=None, threshold=0.0):
+    """Create weights from the distance of each vertex to each influence.
+
+    Weights decrease with the distance to the power of ``falloff``, relative
+    to the closest influence, so they don't depend on the scene scale.
+
+    Args:
+        distances (numpy.ndarray): The ``(vertices x influences)`` distances.
+        falloff (float): How fast the weights decrease with the distance,
+            like the skinCluster ``dropoffRate``.
+        max_influences (int): Maximum amount of influences per vertex.
+            Don't cap the influences if None.
+        threshold (float): Remove weights below this value.
+
+    Returns:
+        numpy.ndarray: The normalized ``(vertices x influences)`` weights.
+    """
+    distances = np.maximum(np.asarray(distances, dtype=DTYPE), 1e-12)
+    if not distances.size:
+        return distances
+    closest = distances.min(axis=1, keepdims=True)
+    array = (closest / distances) ** falloff
+    return prune(array, max_influences, threshold)
+
+
+def get_stats(array, max_influences=None):
+    """Get statistics about the influences per vertex of a weight array.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        max_influences (int): Count the vertices above this limit, if any.
+
+    Returns:
+        dict: The amount of "vertices" and non-zero "weights", the "max" and
+        "mean" influences per vertex and the vertices "over" the limit.
+    """
+    counts = np.count_nonzero(array, axis=1)
+    over = 0
+    if max_influences:
+        over = int(np.count_nonzero(counts > max_influences))
+    return {
+        "vertices": len(counts),
+        "weights": int(counts.sum()),
+        "max": int(counts.max()) if len(counts) else 0,
+        "mean": float(counts.mean()) if len(counts) else 0.0,
+        "over": over,
+    }
+
+
+def smooth(  # pylint: disable=too-many-arguments
+    array, adjacency, iterations=1, strength=1.0, mask=None, locked=None
+):
+    """Smooth the weights over the mesh with a Laplacian operator.
+
+    Each iteration moves the weights of every vertex towards the average of
+    its neighbours, then renormalizes them.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        adjacency (tuple): The ``(indptr, indices)`` CSR vertex adjacency.
+            See :func:`bgdev.utils.mesh.get_adjacency`.
+        iterations (int): Amount of smoothing passes.
+        strength (float): How far towards the average each pass goes.
+        mask (numpy.ndarray): Per-vertex smoothing factors, or the indices of
+            the only vertices to smooth. Smooth all vertices if None.
+        locked (list): Column indices of the locked influences.
+
+    Returns:
+        numpy.ndarray: A smoothed copy of the array.
+    """
+    array = np.array(array, dtype=DTYPE)
+    factors = np.full(len(array), float(strength))
+    if mask is not None:
+        mask = np.asarray(mask)
+        if mask.dtype.kind in "iu":
+            factors[np.setdiff1d(np.arange(len(array)), mask)] = 0.0
+        else:
+            factors *= mask
+    if locked is not None:
+        free = np.ones(array.shape[1], dtype=bool)
+        free[list(locked)] = False
+        columns = np.flatnonzero(free)
+    else:
+        columns = slice(None)
+
+    for _ in range(iterations):
+        delta = get_neighbour_average(array, adjacency) - array
+        array[:, columns] += (delta * factors[:, None])[:, columns]
+        array = normalize(array, locked)
+    return array
+
+
+def get_neighbour_average(array, adjacency, chunk_size=2**22):
+    """Average the values of the neighbours of each vertex.
+
+    Vertices without neighbours keep their own values.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x N)`` values.
+        adjacency (tuple): The ``(indptr, indices)`` CSR vertex adjacency.
+        chunk_size (int): Maximum amount of gathered values at once,
+            to keep the memory in check on large meshes.
+
+    Returns:
+        numpy.ndarray: The ``(vertices x N)`` averaged values.
+    """
+    indptr, indices = adjacency
+    counts = np.diff(indptr)
+    result = np.array(array, dtype=DTYPE)
+    rows = np.flatnonzero(counts)
+    if not len(rows):  # pylint: disable=len-as-condition
+        return result
+
+    step = max(1, chunk_size // len(indices))
+    for start in range(0, array.shape[1], step):
+        columns = slice(start, start + step)
+        sums = np.add.reduceat(array[indices, columns], indptr[rows], axis=0)
+        result[rows, columns] = sums / counts[rows, None]
+    return result
+
+
+def get_symmetry_map(table, vertex_count):
+    """Convert a symmetry table into a vertex permutation array.
+
+    Args:
+        table (dict): Mirrored index of each vertex, with the "left",
+            "right" and "center" sets of vertices.
+            See :class:`bgdev.tools.symmetry_api.Symmetry`.
+        vertex_count (int): Amount of vertices of the mesh.
+
+    Returns:
+        tuple: The ``(vertices,)`` mirrored index of each vertex, vertices
+        missing from the table being their own mirror, and a dict of the
+        "left", "right" and "center" vertex index arrays.
+    """
+    pairs = [(k, v) for k, v in table.items() if not isinstance(k, str)]
+    mirror = np.arange(vertex_count)
+    if pairs:
+        keys, values = np.array(pairs, dtype=np.int64).T
+        mirror[keys] = values
+    sides = {
+        x: np.array(sorted(table.get(x, ())), dtype=np.int64)
+        for x in ("left", "right", "center")
+    }
+    return mirror, sides
+
+
+def mirror(array, vertex_map, influence_map, vertices, center=None):
+    """Copy the weights of the mirrored vertices onto given vertices.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x influences)`` weight array.
+        vertex_map (numpy.ndarray): The mirrored index of each vertex.
+        influence_map (list): The mirrored column of each influence.
+        vertices (numpy.ndarray): The destination vertices.
+        center (numpy.ndarray): Vertices on the symmetry plane, which get
+            the average of their weights and their mirrored weights.
+
+    Returns:
+        numpy.ndarray: A mirrored copy of the array.
+    """
+    array = np.asarray(array, dtype=DTYPE)
+    vertex_map = np.asarray(vertex_map, dtype=np.int64)
+    influence_map = np.asarray(influence_map, dtype=np.int64)
+    result = array.copy()
+    result[vertices] = array[np.ix_(vertex_map[vertices], influence_map)]
+    if center is not None:
+        result[center] = 0.5 * (
+            array[center] + array[np.ix_(center, influence_map)]
+        )
+    return result
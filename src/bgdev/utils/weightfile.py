@@ -0,0 +1,735 @@
+"""Sparse binary file format for skin weights.
+
+A weight file is made of a small JSON header followed by raw NumPy buffers.
+The weights are stored as CSR arrays (``indptr``, ``indices``, ``data``) so
+only the non-zero weights of each vertex are written. Buffers are aligned
+and read through :class:`numpy.memmap`, which means loading a file is
+almost free and only the rows actually used are read from disk. Weights can
+also be quantized to 16 or 8 bits integers with a single scale per file (see
+:func:`quantize`), which :meth:`WeightData.to_dense` undoes transparently.
+
+Layout::
+
+    MAGIC | header size (uint32) | JSON header | padding | buffers...
+
+Several meshes can be streamed into a single pack file, where each mesh is
+a zlib-compressed weight file preceded by its name. The file ends with a
+table of contents giving the offset and size of each block, so a single mesh
+can be read without going through the others::
+
+    PACK_MAGIC | name size (uint32) | block size (uint64) | name | block...
+    | JSON table of contents | TOC offset (uint64) | TOC_MAGIC
+
+Like :mod:`bgdev.utils.weightarray`, this module doesn't need Maya.
+
+:created: 17/10/2026
+:author: Benoit Gielly <benoit.gielly@gmail.com>
+"""
+from __future__ import absolute_import, division
+
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import bgdev.utils.weightarray
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b"BGSKW01\n"
+EXTENSION = ".skw"
+ALIGNMENT = 64
+HEADER_SIZE = struct.Struct("<I")
+PACK_MAGIC = b"BGSKWPK\n"
+BLOCK_HEADER = struct.Struct("<IQ")
+TOC_MAGIC = b"BGSKWTOC"
+TOC_TRAILER = struct.Struct("<Q8s")
+
+# 8 bits steps are 1/255, so their error after renormalization is ~5e-3
+MAX_ERRORS = {8: 1e-2, 16: 1e-3}
+
+
+class WeightData(object):
+    """Sparse skin weights of a single mesh.
+
+    Args:
+        influences (list): Ordered influence names (the columns).
+        vertex_count (int): Amount of vertices (the rows).
+        indptr (numpy.ndarray): CSR row pointers, ``vertex_count + 1`` long.
+        indices (numpy.ndarray): CSR column index of each stored weight.
+        data (numpy.ndarray): CSR value of each stored weight.
+        topology_hash (str): Hash of the mesh topology the weights belong to.
+        arrays (dict): Any extra named arrays to save along the weights.
+        metadata (dict): Any extra JSON-compatible data to save.
+        scale (float): Set when ``data`` holds quantized integers, which
+            are multiplied by the scale to get the weights back.
+            See :func:`quantize`.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        influences,
+        vertex_count,
+        indptr,
+        indices,
+        data,
+        topology_hash="",
+        arrays=None,
+        metadata=None,
+        scale=None,
+    ):
+        self.influences = list(influences)
+        self.vertex_count = int(vertex_count)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.topology_hash = topology_hash or ""
+        self.arrays = dict(arrays or {})
+        self.metadata = dict(metadata or {})
+        self.scale = scale
+
+    def __repr__(self):
+        return "{}(vertices={}, influences={}, weights={})".format(
+            self.__class__.__name__,
+            self.vertex_count,
+            len(self.influences),
+            len(self.data),
+        )
+
+    @classmethod
+    def from_dense(  # pylint: disable=too-many-arguments
+        cls,
+        array,
+        influences,
+        topology_hash="",
+        threshold=0.0,
+        dtype=np.float32,
+        **kwargs
+    ):
+        """Create a WeightData from a dense weight array.
+
+        Args:
+            array (numpy.ndarray): The ``(vertices x influences)`` weights.
+            influences (list): Ordered influence names (the columns).
+            topology_hash (str): Hash of the mesh topology.
+            threshold (float): Weights below or equal are not stored.
+            dtype (numpy.dtype): Storage type of the weight values.
+            kwargs: Extra ``arrays`` and ``metadata`` to store.
+
+        Returns:
+            WeightData: The sparse weights.
+        """
+        array = bgdev.utils.weightarray.check_shape(
+            array, columns=len(influences)
+        )
+        mask = array > threshold
+        rows, columns = np.nonzero(mask)
+        indptr = np.zeros(array.shape[0] + 1, dtype=np.int64)
+        np.cumsum(mask.sum(axis=1), out=indptr[1:])
+        return cls(
+            influences,
+            array.shape[0],
+            indptr,
+            columns.astype(get_index_dtype(len(influences))),
+            array[rows, columns].astype(dtype),
+            topology_hash,
+            **kwargs
+        )
+
+    def get_values(self, slots=None):
+        """Get the stored weights as floats, dequantized if needed.
+
+        Args:
+            slots (numpy.ndarray): Only get the weights at these positions.
+
+        Returns:
+            numpy.ndarray: The weight values.
+        """
+        data = self.data if slots is None else self.data[slots]
+        if self.scale is None:
+            return data
+        return data * bgdev.utils.weightarray.DTYPE(self.scale)
+
+    def to_dense(self, vertices=None):
+        """Expand the sparse weights into a dense weight array.
+
+        Args:
+            vertices (list): Only expand the given rows if any.
+
+        Returns:
+            numpy.ndarray: The ``(vertices x influences)`` weight array.
+        """
+        if vertices is None:
+            rows = np.repeat(
+                np.arange(self.vertex_count), np.diff(self.indptr)
+            )
+            array = np.zeros(
+                (self.vertex_count, len(self.influences)),
+                dtype=bgdev.utils.weightarray.DTYPE,
+            )
+            array[rows, self.indices] = self.get_values()
+            return array
+
+        vertices = np.asarray(vertices, dtype=np.int64)
+        starts = self.indptr[vertices].astype(np.int64)
+        ends = self.indptr[vertices + 1].astype(np.int64)
+        counts = ends - starts
+        rows = np.repeat(np.arange(len(vertices)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        slots = np.repeat(starts, counts) + offsets
+        array = np.zeros(
+            (len(vertices), len(self.influences)),
+            dtype=bgdev.utils.weightarray.DTYPE,
+        )
+        array[rows, self.indices[slots]] = self.get_values(slots)
+        return array
+
+
+def get_index_dtype(count):
+    """Get the smallest unsigned type able to index ``count`` influences."""
+    if count <= np.iinfo(np.uint8).max:
+        return np.uint8
+    if count <= np.iinfo(np.uint16).max:
+        return np.uint16
+    return np.uint32
+
+
+def _align(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def encode(weight_data):
+    """Encode the given weights into the binary weight file format.
+
+    Args:
+        weight_data (WeightData): The weights to encode.
+
+    Returns:
+        bytes: The encoded weights.
+    """
+    buffers = [
+        ("indptr", weight_data.indptr),
+        ("indices", weight_data.indices),
+        ("data", weight_data.data),
+    ]
+    buffers.extend(sorted(weight_data.arrays.items()))
+
+    offset, layout, blobs = 0, {}, []
+    for name, array in buffers:
+        array = np.ascontiguousarray(array)
+        layout[name] = {
+            "dtype": array.dtype.newbyteorder("<").str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        blob = array.astype(array.dtype.newbyteorder("<")).tobytes()
+        padding = _align(len(blob)) - len(blob)
+        blobs.append(blob + b"\0" * padding)
+        offset += len(blob) + padding
+
+    header = {
+        "influences": weight_data.influences,
+        "vertex_count": weight_data.vertex_count,
+        "topology_hash": weight_data.topology_hash,
+        "metadata": weight_data.metadata,
+        "buffers": layout,
+    }
+    if weight_data.scale is not None:
+        header["scale"] = weight_data.scale
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    start = len(MAGIC) + HEADER_SIZE.size + len(header)
+    header += b" " * (_align(start) - start)
+    return b"".join([MAGIC, HEADER_SIZE.pack(len(header)), header] + blobs)
+
+
+def decode(buffer):
+    """Decode weights from a buffer in the binary weight file format.
+
+    The returned arrays are views on the given buffer, nothing is copied.
+
+    Args:
+        buffer (bytes or numpy.ndarray): The encoded weights.
+
+    Raises:
+        ValueError: If the buffer isn't a valid weight file.
+
+    Returns:
+        WeightData: The decoded weights.
+    """
+    view = memoryview(buffer)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a valid weight file.")
+
+    start = len(MAGIC) + HEADER_SIZE.size
+    size = HEADER_SIZE.unpack(bytes(view[len(MAGIC) : start]))[0]
+    header = json.loads(bytes(view[start : start + size]).decode("utf-8"))
+    start += size
+
+    arrays = {}
+    for name, info in header["buffers"].items():
+        dtype = np.dtype(info["dtype"])
+        count = int(np.prod(info["shape"]))
+        array = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=start + info["offset"]
+        )
+        arrays[name] = array.reshape(info["shape"])
+
+    return WeightData(
+        header["influences"],
+        header["vertex_count"],
+        arrays.pop("indptr"),
+        arrays.pop("indices"),
+        arrays.pop("data"),
+        header.get("topology_hash", ""),
+        arrays=arrays,
+        metadata=header.get("metadata"),
+        scale=header.get("scale"),
+    )
+
+
+def save(path, weight_data):
+    """Save the given weights into a binary weight file.
+
+    Args:
+        path (str): Path of the file to write.
+        weight_data (WeightData): The weights to save.
+
+    Returns:
+        str: The given file path.
+    """
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+
+    with open(path, "wb") as stream:
+        stream.write(encode(weight_data))
+    return path
+
+
+def load(path, mmap=True):
+    """Load weights from a binary weight file.
+
+    Args:
+        path (str): Path of the file to read.
+        mmap (bool): Memory-map the file instead of reading it entirely.
+            Only the parts of the arrays that are accessed are then read.
+
+    Returns:
+        WeightData: The loaded weights.
+    """
+    if mmap:
+        return decode(np.memmap(path, dtype=np.uint8, mode="r"))
+    with open(path, "rb") as stream:
+        return decode(stream.read())
+
+
+def quantize(weight_data, bits=16, max_error=None):
+    """Store the weights as unsigned integers with a single scale.
+
+    Weights rounding to zero are dropped. The reconstructed weights are
+    renormalized and compared to the original ones, so the error is checked
+    against what is actually applied on import.
+
+    Args:
+        weight_data (WeightData): The weights to quantize.
+        bits (int): Either 16, or 8 for previews.
+        max_error (float): Maximum error allowed on any weight. Defaults to
+            the one of the bit depth in :data:`MAX_ERRORS`.
+
+    Raises:
+        ValueError: If the bits aren't supported or the error is too big.
+
+    Returns:
+        WeightData: The quantized weights, sharing the other arrays.
+    """
+    dtypes = {8: np.uint8, 16: np.uint16}
+    if bits not in dtypes:
+        raise ValueError("Can't quantize on {} bits.".format(bits))
+    if max_error is None:
+        max_error = MAX_ERRORS[bits]
+
+    values = weight_data.get_values().astype(np.float64)
+    peak = values.max() if len(values) else 1.0
+    scale = float(peak) / np.iinfo(dtypes[bits]).max if peak > 0 else 1.0
+    codes = np.rint(values / scale).astype(dtypes[bits])
+
+    # check the error after renormalization, as done on import
+    counts = np.diff(weight_data.indptr)
+    rows = np.repeat(np.arange(weight_data.vertex_count), counts)
+    restored = codes * scale
+    error = np.abs(
+        _normalize_rows(restored, rows, weight_data.vertex_count)
+        - _normalize_rows(values, rows, weight_data.vertex_count)
+    )
+    error = float(error.max()) if len(error) else 0.0
+    if error > max_error:
+        raise ValueError(
+            "Quantization error {:.2e} is above {:.2e}.".format(
+                error, max_error
+            )
+        )
+
+    # the row pointers are the other large array, shrink them too
+    keep = codes > 0
+    counts = np.bincount(rows[keep], minlength=weight_data.vertex_count)
+    indptr = np.zeros(weight_data.vertex_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indptr = indptr.astype(get_index_dtype(indptr[-1]))
+    metadata = dict(weight_data.metadata, quantization_error=error)
+    return WeightData(
+        weight_data.influences,
+        weight_data.vertex_count,
+        indptr,
+        weight_data.indices[keep],
+        codes[keep],
+        weight_data.topology_hash,
+        arrays=weight_data.arrays,
+        metadata=metadata,
+        scale=scale,
+    )
+
+
+def _normalize_rows(values, rows, count):
+    totals = np.bincount(rows, weights=values, minlength=count)[rows]
+    return np.divide(
+        values, totals, out=np.zeros_like(values), where=totals > 0
+    )
+
+
+def get_fingerprint(weight_data):
+    """Get the hashes identifying the given weights.
+
+    The extra arrays, like the rest points or UVs, are hashed too so weights
+    whose geometry moved with the same topology don't match anymore.
+
+    Args:
+        weight_data (WeightData): The weights to hash.
+
+    Returns:
+        dict: The topology, weights, influences and arrays hashes.
+    """
+    hash_arrays = bgdev.utils.weightarray.hash_arrays
+    names = sorted(weight_data.arrays)
+    return {
+        "topology": weight_data.topology_hash,
+        "weights": hash_arrays(
+            weight_data.indptr, weight_data.indices, weight_data.data
+        ),
+        "influences": hash_arrays(np.array(weight_data.influences, np.str_)),
+        "arrays": hash_arrays(
+            np.array(names, np.str_), *(weight_data.arrays[x] for x in names)
+        ),
+    }
+
+
+def compress(weight_data, level=6):
+    """Encode and compress the given weights into a pack block.
+
+    This releases the GIL while compressing, so it can run in a thread.
+
+    Args:
+        weight_data (WeightData): The weights to compress.
+        level (int): The zlib compression level.
+
+    Returns:
+        bytes: The compressed block.
+    """
+    return zlib.compress(encode(weight_data), level)
+
+
+def decompress(block):
+    """Decompress and decode weights from a pack block.
+
+    Args:
+        block (bytes): The compressed block.
+
+    Returns:
+        WeightData: The decoded weights.
+    """
+    return decode(zlib.decompress(block))
+
+
+class PackWriter(object):
+    """Stream compressed weight blocks of several meshes into one file.
+
+    Example:
+        ::
+
+            with PackWriter(path) as writer:
+                for mesh, weight_data in data.items():
+                    writer.write(mesh, compress(weight_data))
+
+    """
+
+    MAGIC = PACK_MAGIC
+
+    def __init__(self, path):
+        self.path = path
+        self.stream = None
+        self.index = OrderedDict()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def open(self):
+        """Create the file and write the pack header."""
+        parent = os.path.dirname(self.path)
+        if parent and not os.path.exists(parent):
+            os.makedirs(parent)
+        self.stream = open(self.path, "wb")
+        self.stream.write(self.MAGIC)
+
+    def write(self, name, block):
+        """Append a compressed block to the file.
+
+        Args:
+            name (str): Name of the mesh the block belongs to.
+            block (bytes): The compressed block, see :func:`compress`.
+        """
+        encoded = name.encode("utf-8")
+        self.stream.write(BLOCK_HEADER.pack(len(encoded), len(block)))
+        self.stream.write(encoded)
+        self.index[name] = [self.stream.tell(), len(block)]
+        self.stream.write(block)
+
+    def close(self):
+        """Write the table of contents and close the file."""
+        if self.stream:
+            offset = self.stream.tell()
+            self.stream.write(json.dumps(self.index).encode("utf-8"))
+            self.stream.write(TOC_TRAILER.pack(offset, TOC_MAGIC))
+            self.stream.close()
+            self.stream = None
+
+
+def is_pack(path):
+    """Check if given file is a pack file."""
+    with open(path, "rb") as stream:
+        return stream.read(len(PACK_MAGIC)) == PACK_MAGIC
+
+
+def read_index(path):
+    """Read the table of contents of a pack file.
+
+    Args:
+        path (str): Path of the pack file.
+
+    Returns:
+        OrderedDict: The offset and size of each block, by mesh name.
+        None if the file doesn't have a table of contents.
+    """
+    with open(path, "rb") as stream:
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        if size < len(PACK_MAGIC) + TOC_TRAILER.size:
+            return None
+        stream.seek(size - TOC_TRAILER.size)
+        offset, magic = TOC_TRAILER.unpack(stream.read(TOC_TRAILER.size))
+        if magic != TOC_MAGIC:
+            return None
+        stream.seek(offset)
+        toc = stream.read(size - TOC_TRAILER.size - offset)
+    return json.loads(toc.decode("utf-8"), object_pairs_hook=OrderedDict)
+
+
+def iter_pack(path, names=None):
+    """Iterate over the blocks of a pack file.
+
+    When the file has a table of contents, only the requested blocks are
+    read, otherwise the file is scanned and the other blocks skipped.
+
+    Args:
+        path (str): Path of the pack file.
+        names (list): Only yield the blocks of these meshes if given.
+
+    Yields:
+        tuple: The mesh name and its decompressed :class:`WeightData`.
+    """
+    names = set(names) if names is not None else None
+    index = read_index(path)
+    with open(path, "rb") as stream:
+        if stream.read(len(PACK_MAGIC)) != PACK_MAGIC:
+            raise ValueError("Not a valid pack file: {}".format(path))
+
+        if index is not None:
+            for name, (offset, size) in index.items():
+                if names is None or name in names:
+                    stream.seek(offset)
+                    yield name, decompress(stream.read(size))
+            return
+
+        while True:
+            header = stream.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            name_size, block_size = BLOCK_HEADER.unpack(header)
+            name = stream.read(name_size).decode("utf-8")
+            if names is not None and name not in names:
+                stream.seek(block_size, os.SEEK_CUR)
+                continue
+            yield name, decompress(stream.read(block_size))
+
+
+def from_ngskintools(ng_data):
+    """Convert ngSkinTools JSON data into sparse weights.
+
+    Layers are flattened from bottom to top using their opacity and mask,
+    which gives the final weights of the skincluster.
+
+    Args:
+        ng_data (str or dict): The ngSkinTools JSON data.
+
+    Returns:
+        WeightData: The converted weights.
+    """
+    if not isinstance(ng_data, dict):
+        ng_data = json.loads(ng_data)
+
+    # influences are stored by index, names are in the influences table
+    table = ng_data.get("influences", {})
+    names = {
+        int(x.get("index", key)): x.get("path", "").rpartition("|")[-1]
+        for key, x in table.items()
+    }
+    layers = [x for x in ng_data.get("layers", []) if x.get("enabled", 1)]
+    count = max(
+        [len(x["weights"]) for y in layers for x in y.get("influences", [])]
+        or [0]
+    )
+
+    influences = []
+    columns = {}
+    for layer in layers:
+        for each in layer.get("influences", []):
+            name = names.get(each.get("index"), each.get("name", ""))
+            name = name.rpartition("|")[-1]
+            if name not in columns:
+                columns[name] = len(influences)
+                influences.append(name)
+
+    array = np.zeros((count, len(influences)), dtype=np.float64)
+    for layer in reversed(layers):
+        values = np.zeros_like(array)
+        for each in layer.get("influences", []):
+            name = names.get(each.get("index"), each.get("name", ""))
+            weights = np.asarray(each["weights"], dtype=np.float64)
+            values[: len(weights), columns[name.rpartition("|")[-1]]] = weights
+        mask = np.asarray(layer.get("mask") or np.ones(count), np.float64)
+        blend = (mask * float(layer.get("opacity", 1.0)))[:, None]
+
+        # a layer only covers the lower ones as much as it holds weights
+        coverage = np.clip(values.sum(axis=1, keepdims=True), 0.0, 1.0)
+        array = array * (1.0 - blend * coverage) + values * blend
+
+    # keep the mesh stored by ngSkinTools to allow closestPoint transfers
+    arrays = {}
+    mesh = ng_data.get("mesh") or {}
+    points = mesh.get("verts", mesh.get("vertices"))
+    if points and mesh.get("triangles"):
+        arrays["points"] = np.asarray(points, np.float32).reshape(-1, 3)
+        arrays["triangles"] = np.asarray(mesh["triangles"], np.int32)
+        arrays["triangles"] = arrays["triangles"].reshape(-1, 3)
+
+    return WeightData.from_dense(array, influences, arrays=arrays)
+
+
+def convert_json_file(path, output=None):
+    """Convert an exported ngSkinTools JSON file into a binary weight file.
+
+    Args:
+        path (str): Path of the JSON file.
+        output (str): Path of the binary file.
+            Defaults to the JSON path with the binary extension.
+
+    Returns:
+        str: Path of the binary file.
+    """
+    output = output or os.path.splitext(path)[0] + EXTENSION
+    with open(path, "r") as stream:
+        weight_data = from_ngskintools(stream.read())
+    return save(output, weight_data)
+
+
+def benchmark(paths, repeat=3):
+    """Compare the JSON and binary weight formats.
+
+    Each JSON file is written back the way :mod:`bgdev.utils.weightmap`
+    does (``indent=4``) and converted into the binary format, then both are
+    read again. Times are the best of ``repeat`` runs, in seconds.
+
+    Args:
+        paths (list): Paths of ngSkinTools JSON files.
+        repeat (int): Amount of runs per measure.
+
+    Returns:
+        dict: The file size, write time and read time of each format.
+    """
+
+    def best_of(func):
+        timings = []
+        for _ in range(repeat):
+            start = time.time()
+            func()
+            timings.append(time.time() - start)
+        return min(timings)
+
+    result = {
+        key: {"size": 0, "write": 0.0, "read": 0.0}
+        for key in ("json", "binary")
+    }
+    folder = tempfile.mkdtemp()
+    try:
+        for path in paths:
+            with open(path, "r") as stream:
+                ng_data = json.load(stream)
+            weight_data = from_ngskintools(ng_data)
+            json_path = os.path.join(folder, "weights.json")
+            binary_path = os.path.join(folder, "weights" + EXTENSION)
+
+            def write_json():
+                with open(json_path, "w") as stream:
+                    json.dump(ng_data, stream, indent=4)
+
+            def read_json():
+                with open(json_path, "r") as stream:
+                    json.load(stream)
+
+            def write_binary():
+                save(binary_path, weight_data)
+
+            def read_binary():
+                load(binary_path).to_dense()
+
+            for key, write, read, output in (
+                ("json", write_json, read_json, json_path),
+                ("binary", write_binary, read_binary, binary_path),
+            ):
+                result[key]["write"] += best_of(write)
+                result[key]["read"] += best_of(read)
+                result[key]["size"] += os.path.getsize(output)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    for key, info in sorted(result.items()):
+        LOG.info(
+            "%s: %.2f MB, write %.3fs, read %.3fs",
+            key,
+            info["size"] / 1024.0 / 1024.0,
+            info["write"],
+            info["read"],
+        )
+    return result
@@ -5,17 +5,33 @@
 """
 from __future__ import absolute_import
 
+import collections
 import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 
+import numpy as np
 from maya import cmds
 
+import bgdev.api.attribute
+import bgdev.api.core
+import bgdev.utils.contexts
 import bgdev.utils.decorator
+import bgdev.utils.deformer
+import bgdev.utils.mesh
 import bgdev.utils.skincluster
+import bgdev.utils.spatial
+import bgdev.utils.weightarray
+import bgdev.utils.weightfile
 
 LOG = logging.getLogger(__name__)
 DEFAULT_PATH = os.path.join(os.environ.get("MAYA_APP_DIR", ""), "weights")
+TOC_EXTENSION = ".toc"
+MANIFEST_EXTENSION = ".manifest"
+POSITION_TOLERANCE = 1e-3
 
 
 def check_libraries():
@@ -30,7 +46,6 @@ def check_libraries():
 
     """
     try:
-
         if not cmds.pluginInfo("ngSkinTools", query=True, loaded=True):
             cmds.loadPlugin("ngSkinTools", quiet=True)
 
@@ -55,29 +70,348 @@ def check_libraries():
         raise
 
 
-def export_multiple_skinweights(nodes, path=DEFAULT_PATH):
+def export_multiple_skinweights(  # pylint: disable=too-many-arguments
+    nodes,
+    path=DEFAULT_PATH,
+    binary=False,
+    incremental=False,
+    workers=None,
+    queue_size=16,
+    bits=None,
+    max_error=None,
+):
     """Export multiple skinweights into a single file.
 
+    Weights are read one mesh at a time on the main thread, then serialized
+    (and compressed for binary files) in a thread pool. Each mesh is written
+    to the file as soon as it's ready, in order, and at most ``queue_size``
+    meshes are in flight so memory stays flat whatever the amount of meshes.
+
+    A manifest storing the topology, weights, influences and geometry
+    hashes of each mesh is saved next to the file (see
+    :func:`read_manifest`). The hashes are computed on the bulk weight
+    arrays for both formats, so the JSON layers are only exported from
+    ngSkinTools for meshes which changed.
+
     Args:
         nodes (str): List of nodes to export their skinweights.
         path (str): File path to export weights.
+        binary (bool): Write a binary pack file (see
+            :class:`bgdev.utils.weightfile.PackWriter`) instead of JSON.
+        incremental (bool): Reuse the data already in the file for meshes
+            whose hashes match the manifest instead of exporting them again.
+        workers (int): Amount of threads used to serialize the weights.
+        queue_size (int): Maximum amount of meshes waiting to be written.
+        bits (int): Quantize the binary weights on 16 or 8 bits.
+            See :func:`quantize_weight_data`.
+        max_error (float): Maximum quantization error allowed on any
+            weight. Defaults to the one of the bit depth.
 
-    """
-    data = {}
-    for each in sorted(nodes):
-        weights = export_skinweights(each)
-        if weights:
-            data[each] = weights
+    Returns:
+        dict: The time spent in each stage, in seconds.
 
+    """
     # create parent folder if doesn't exists
     parent = os.path.dirname(path)
     if not os.path.exists(parent):
         os.makedirs(parent)
 
-    # export combined weights data
-    with open(path, "w") as stream:
-        json.dump(data, stream, indent=4)
-    LOG.info("Weights successfully exported!")
+    # find the data that can be reused from the previous export
+    manifest, index = {}, None
+    if incremental and os.path.exists(path):
+        manifest = read_manifest(path)
+        if not binary:
+            index = read_json_index(path)
+        elif bgdev.utils.weightfile.is_pack(path):
+            index = bgdev.utils.weightfile.read_index(path)
+    index = index or {}
+
+    fingerprints, reused = {}, []
+    previous = open(path, "rb") if index else None
+
+    def read(node):
+        # the bulk weight arrays are always read to fingerprint the mesh
+        weight_data = export_skinweights(node, export=False, binary=True)
+        if not weight_data:
+            return None
+        fingerprint = bgdev.utils.weightfile.get_fingerprint(weight_data)
+        if binary and bits:
+            fingerprint["bits"] = bits
+            fingerprint["max_error"] = max_error
+        fingerprints[node] = fingerprint
+        if node in index and manifest.get(node) == fingerprint:
+            offset, size = index[node]
+            previous.seek(offset)
+            reused.append(node)
+            return UnchangedData(previous.read(size))
+        if binary:
+            return weight_data
+        return export_skinweights(node, export=False)
+
+    def serialize(data):
+        if isinstance(data, UnchangedData):
+            return data if not binary else data.raw
+        if binary:
+            if bits:
+                data = quantize_weight_data(data, bits, max_error)
+            return bgdev.utils.weightfile.compress(data)
+        return json.dumps(data, indent=4)
+
+    # write into a temporary file as the previous one may still be read
+    temp_path = path + ".tmp"
+    writer_class = bgdev.utils.weightfile.PackWriter
+    if not binary:
+        writer_class = JsonStreamWriter
+    try:
+        with writer_class(temp_path) as writer:
+            timings = stream_export(
+                sorted(nodes),
+                read,
+                serialize,
+                writer.write,
+                workers=workers,
+                queue_size=queue_size,
+            )
+    finally:
+        if previous:
+            previous.close()
+
+    replace_file(temp_path, path)
+    if not binary:
+        replace_file(temp_path + TOC_EXTENSION, path + TOC_EXTENSION)
+    with open(path + MANIFEST_EXTENSION, "w") as stream:
+        json.dump(fingerprints, stream, indent=4, sort_keys=True)
+
+    if incremental:
+        LOG.info("Reused %s/%s meshes.", len(reused), len(fingerprints))
+    LOG.info(
+        "Weights successfully exported! (%s)",
+        ", ".join("{} {:.2f}s".format(*x) for x in sorted(timings.items())),
+    )
+    return timings
+
+
+class UnchangedData(object):
+    """Already serialized data of a mesh that didn't change since last export.
+
+    Args:
+        raw (bytes): The serialized data, as read from the file. It's written
+            back as is.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+
+
+def replace_file(source, destination):
+    """Move a file over another one, replacing it if it exists.
+
+    This uses ``os.replace`` when available, which doesn't exist on Python 2
+    where ``os.rename`` fails on Windows if the destination exists.
+
+    Args:
+        source (str): Path of the file to move.
+        destination (str): Path to move the file to.
+    """
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+        return
+    if os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
+
+
+def read_manifest(path):
+    """Read the manifest saved next to a combined weight file.
+
+    Args:
+        path (str): Path of the combined weight file.
+
+    Returns:
+        dict: The topology, weights, influences and geometry hashes of each
+        mesh. See :func:`bgdev.utils.weightfile.get_fingerprint`.
+    """
+    manifest_path = path + MANIFEST_EXTENSION
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as stream:
+        return json.load(stream)
+
+
+def get_stale_meshes(path, nodes=None):
+    """Get the meshes whose topology changed since their weights were exported.
+
+    Args:
+        path (str): Path of the combined weight file.
+        nodes (list): Only check these meshes if given.
+
+    Returns:
+        list: The meshes whose exported weights don't match the scene anymore.
+    """
+    stale = []
+    for node, fingerprint in sorted(read_manifest(path).items()):
+        if nodes is not None and node not in nodes:
+            continue
+        if not cmds.objExists(node):
+            continue
+        topology = bgdev.utils.mesh.get_topology_hash(node)
+        if topology != fingerprint.get("topology"):
+            stale.append(node)
+    return stale
+
+
+def stream_export(  # pylint: disable=too-many-arguments
+    nodes, read, serialize, write, workers=None, queue_size=16
+):
+    """Read, serialize and write the data of each node in a pipeline.
+
+    Args:
+        nodes (list): The nodes to process, in order.
+        read (function): Get the data of a node. Always runs in the
+            calling (main) thread as Maya requires it.
+            Nodes whose data is empty are skipped.
+        serialize (function): Turn the data into what will be written.
+            Runs in a thread pool so it should release the GIL.
+        write (function): Called with the node and its serialized data,
+            in the same order as the nodes.
+        workers (int): Amount of threads in the pool.
+        queue_size (int): Maximum amount of nodes in flight.
+            Nodes are processed one by one when ``concurrent.futures``
+            isn't available (Python 2 without the futures backport).
+
+    Returns:
+        dict: The time spent in each stage, in seconds. The serialize time
+        is the sum of all threads, the wait time is how long the main thread
+        was blocked on the pool.
+    """
+    timings = {"read": 0.0, "serialize": 0.0, "write": 0.0, "wait": 0.0}
+    lock = threading.Lock()
+
+    def timed_serialize(data):
+        start = time.time()
+        result = serialize(data)
+        with lock:
+            timings["serialize"] += time.time() - start
+        return result
+
+    def flush(pending, block):
+        while pending and (block or pending[0][1].done()):
+            node, future = pending.popleft()
+            start = time.time()
+            result = future.result()
+            timings["wait"] += time.time() - start
+            start = time.time()
+            write(node, result)
+            timings["write"] += time.time() - start
+            block = False
+
+    try:
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        for node in nodes:
+            start = time.time()
+            data = read(node)
+            timings["read"] += time.time() - start
+            if data:
+                result = timed_serialize(data)
+                start = time.time()
+                write(node, result)
+                timings["write"] += time.time() - start
+        return timings
+
+    pending = collections.deque()
+    with ThreadPoolExecutor(workers) as pool:
+        for node in nodes:
+            start = time.time()
+            data = read(node)
+            timings["read"] += time.time() - start
+            if data:
+                pending.append((node, pool.submit(timed_serialize, data)))
+            flush(pending, block=len(pending) >= queue_size)
+        while pending:
+            flush(pending, block=True)
+
+    return timings
+
+
+class JsonStreamWriter(object):
+    """Write the key/value pairs of a JSON object as they come.
+
+    The offset and size of each value are saved in a table of contents next
+    to the file, so :func:`import_multiple_skinweights` can read only the
+    values it needs (see :func:`read_json_index`).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stream = None
+        self.index = OrderedDict()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def _write(self, text):
+        self.stream.write(text.encode("utf-8"))
+
+    def open(self):
+        """Create the file and open the JSON object."""
+        self.stream = open(self.path, "wb")
+        self._write("{")
+
+    def write(self, key, value):
+        """Write a serialized value under given key.
+
+        Args:
+            key (str): The key of the value.
+            value (str or UnchangedData): The serialized value, indented to
+                fit in the object, or a value already written by this class
+                which is copied unchanged.
+        """
+        prefix = "," if self.index else ""
+        self._write("{}\n    {}: ".format(prefix, json.dumps(key)))
+        offset = self.stream.tell()
+        if isinstance(value, UnchangedData):
+            self.stream.write(value.raw)
+        else:
+            self._write(value.replace("\n", "\n    "))
+        self.index[key] = [offset, self.stream.tell() - offset]
+
+    def close(self):
+        """Close the JSON object and write the table of contents."""
+        if not self.stream:
+            return
+        self._write("\n}\n")
+        self.stream.close()
+        self.stream = None
+        toc = {"size": os.path.getsize(self.path), "entries": self.index}
+        with open(self.path + TOC_EXTENSION, "w") as stream:
+            json.dump(toc, stream)
+
+
+def read_json_index(path):
+    """Read the table of contents of a combined JSON weight file.
+
+    Args:
+        path (str): Path of the combined JSON file.
+
+    Returns:
+        OrderedDict: The offset and size of each value, by mesh name.
+        None if there's no table of contents or if it's out of date.
+    """
+    toc_path = path + TOC_EXTENSION
+    if not os.path.exists(toc_path):
+        return None
+    with open(toc_path, "r") as stream:
+        toc = json.load(stream, object_pairs_hook=OrderedDict)
+    if toc.get("size") != os.path.getsize(path):
+        LOG.debug("Table of contents of %r is out of date.", path)
+        return None
+    return toc.get("entries")
 
 
 @bgdev.utils.decorator.REPEAT
@@ -94,7 +428,14 @@ def export_skinweights_callback():
     LOG.info("Weights successfully exported!")
 
 
-def export_skinweights(node, path=DEFAULT_PATH, export=True):
+def export_skinweights(  # pylint: disable=too-many-arguments
+    node,
+    path=DEFAULT_PATH,
+    export=True,
+    binary=False,
+    bits=None,
+    max_error=None,
+):
     """Export the weights of the given skincluster node.
 
     Args:
@@ -102,9 +443,16 @@ def export_skinweights(node, path=DEFAULT_PATH, export=True):
         path (str): File path to export the weights.
         export (bool): Export weights into a file.
             Defaults to True. Use False when you only want the weights data.
+        binary (bool): Use the sparse binary format of
+            :mod:`bgdev.utils.weightfile` instead of the ngSkinTools JSON.
+            This doesn't need ngSkinTools and is much smaller and faster.
+        bits (int): Quantize the binary weights on 16 or 8 bits.
+            See :func:`quantize_weight_data`.
+        max_error (float): Maximum quantization error allowed on any
+            weight. Defaults to the one of the bit depth.
 
     Returns:
-        dict: The weights data.
+        dict or WeightData: The weights data.
 
     """
     json_data = {}
@@ -113,6 +461,15 @@ def export_skinweights(node, path=DEFAULT_PATH, export=True):
     if not bgdev.utils.skincluster.get_skincluster(node):
         return json_data
 
+    if binary:
+        weight_data = get_weight_data(node)
+        if bits:
+            weight_data = quantize_weight_data(weight_data, bits, max_error)
+        if export:
+            export_weight_data(node, weight_data, path)
+            LOG.info("Saving %r weights...", str(node))
+        return weight_data
+
     modules = check_libraries()
 
     # create the folder if doesn't exist
@@ -158,18 +515,155 @@ def export_layer_data(node, data, path):
         stream.write(data)
 
 
-def import_multiple_skinweights(path, layers=True):
+def get_weight_data(node, geometry=True):
+    """Get the skin weights of given node as sparse weights.
+
+    Args:
+        node (str): Name of the skinned node.
+        geometry (bool): Also store the world space rest points, triangles
+            and UVs of the mesh, required to import in "position",
+            "closestPoint" and "UV" modes (see :func:`apply_weight_data`).
+            The rest points are the ones of the shape before deformation,
+            so the current pose doesn't change them.
+
+    Returns:
+        WeightData: The sparse weights of the node.
+    """
+    skincluster = bgdev.utils.skincluster.get_skincluster(node)
+    influences = bgdev.utils.skincluster.get_influences(skincluster)
+    arrays = {}
+    if geometry:
+        uvs, uv_triangles = bgdev.utils.mesh.get_uv_triangles(node)
+        rest = bgdev.utils.mesh.get_rest_shape(node)
+        arrays = {
+            "points": bgdev.utils.mesh.get_points(rest).astype(np.float32),
+            "triangles": bgdev.utils.mesh.get_triangles(node),
+            "uvs": uvs.astype(np.float32),
+            "uv_triangles": uv_triangles,
+        }
+    return bgdev.utils.weightfile.WeightData.from_dense(
+        bgdev.utils.skincluster.get_weights(skincluster),
+        [x.rpartition("|")[-1] for x in influences],
+        bgdev.utils.mesh.get_topology_hash(node),
+        arrays=arrays,
+    )
+
+
+def quantize_weight_data(weight_data, bits, max_error=None):
+    """Quantize sparse weights, keeping them as is if the error is too big.
+
+    Quantized weights are dequantized transparently on import.
+
+    Args:
+        weight_data (WeightData): The sparse weights to quantize.
+        bits (int): Either 16, or 8 for previews.
+        max_error (float): Maximum error allowed on the imported weights.
+            Defaults to the one of the bit depth, see
+            :data:`bgdev.utils.weightfile.MAX_ERRORS`.
+
+    Returns:
+        WeightData: The quantized weights, or the given ones on failure.
+    """
+    try:
+        return bgdev.utils.weightfile.quantize(weight_data, bits, max_error)
+    except ValueError as error:
+        LOG.warning("Keeping full precision weights: %s", error)
+        return weight_data
+
+
+def export_weight_data(node, data, path):
+    """Export sparse weights into a binary weight file.
+
+    Args:
+        node (str): Name of the mesh. Used as filename.
+        data (WeightData): The sparse weights to export.
+        path (str): The parent folder where the file will be saved into.
+    """
+    nice_name = node.rsplit("|")[-1].rsplit(":")[-1]
+    weight_file = os.path.join(
+        path, nice_name + bgdev.utils.weightfile.EXTENSION
+    )
+    bgdev.utils.weightfile.save(weight_file, data)
+
+
+def import_multiple_skinweights(
+    path, layers=True, mode="vertexID", headless=False
+):
     """Import multiple skinweights into a single file.
 
+    Both the JSON and binary pack files are supported. When the file has a
+    table of contents, only the meshes that exist in the scene are read.
+
+    The ngSkinTools imports are grouped in a single undo chunk. Binary files
+    and headless imports write the weights with
+    :func:`apply_weight_data`, which can't be undone.
+
     Args:
         path (str): File path to export weights.
         layers (bool): Keep ngSkinTools layers or not.
+        mode (str) : Can be "vertexID", "position", "UV" or
+            "closestPoint".
+        headless (bool): Import JSON data without ngSkinTools' UI.
+            See :func:`import_skinweights`.
 
     """
     if not os.path.exists(path):
         LOG.info("%r not found.", path)
         return
 
+    stale = get_stale_meshes(path)
+    if stale:
+        LOG.warning("Topology changed since export: %s", ", ".join(stale))
+
+    if bgdev.utils.weightfile.is_pack(path):
+        index = bgdev.utils.weightfile.read_index(path)
+        names = None
+        if index is not None:
+            names = [x for x in index if cmds.objExists(x)]
+            LOG.info("Importing %s/%s meshes...", len(names), len(index))
+        pack = bgdev.utils.weightfile.iter_pack(path, names)
+        for node, weight_data in pack:
+            if cmds.objExists(node):
+                apply_weight_data(node, weight_data, mode=mode)
+        LOG.info("Weights successfully imported!")
+        return
+
+    flags = {"layers": layers, "mode": mode, "headless": headless}
+    if headless:
+        import_json_skinweights(path, **flags)
+    else:
+        with bgdev.utils.contexts.undo_chunk("import_multiple_skinweights"):
+            import_json_skinweights(path, **flags)
+
+
+def import_json_skinweights(
+    path, layers=True, mode="vertexID", headless=False
+):
+    """Import the meshes of a combined JSON weight file.
+
+    Args:
+        path (str): File path of the combined JSON file.
+        layers (bool): Keep ngSkinTools layers or not.
+        mode (str) : Can be "vertexID", "position", "UV" or
+            "closestPoint".
+        headless (bool): Import JSON data without ngSkinTools' UI.
+            See :func:`import_skinweights`.
+
+    """
+    flags = {"layers": layers, "mode": mode, "headless": headless}
+    index = read_json_index(path)
+    if index is not None:
+        names = [x for x in index if cmds.objExists(x)]
+        LOG.info("Importing %s/%s meshes...", len(names), len(index))
+        with open(path, "rb") as stream:
+            for node in sorted(names):
+                offset, size = index[node]
+                stream.seek(offset)
+                ng_data = json.loads(stream.read(size).decode("utf-8"))
+                import_skinweights(node, data=ng_data, **flags)
+        LOG.info("Weights successfully imported!")
+        return
+
     with open(path, "r") as stream:
         data = json.load(stream)
 
@@ -185,7 +679,7 @@ def import_multiple_skinweights(path, layers=True):
 
     for node, ng_data in sorted(data.items()):
         if cmds.objExists(node):
-            import_skinweights(node, data=ng_data, layers=layers)
+            import_skinweights(node, data=ng_data, **flags)
 
     LOG.info("Weights successfully imported!")
 
@@ -206,8 +700,14 @@ def import_skinweights_callback():
     cmds.select(selection)
 
 
-def import_skinweights(  # pylint: disable=too-many-locals
-    node, path=DEFAULT_PATH, data=None, layers=True, mode="vertexID"
+def import_skinweights(  # pylint: disable=too-many-arguments
+    node,
+    path=DEFAULT_PATH,
+    data=None,
+    layers=True,
+    mode="vertexID",
+    binary=False,
+    headless=False,
 ):
     """Export the weights of the given skincluster node.
 
@@ -216,10 +716,36 @@ def import_skinweights(  # pylint: disable=too-many-locals
         path (str): File path to export the weights.
         data (dict): Use this data directly instead of reading if from file.
         layers (bool) : Keep ngSkinTools layers or not.
-        mode (str) : Can be "vertexID", "UV" or "closestPoint".
+        mode (str) : Can be "vertexID", "position", "UV" or
+            "closestPoint".
             Defaults to "vertexID".
+        binary (bool): Read the sparse binary format of
+            :mod:`bgdev.utils.weightfile` instead of the ngSkinTools JSON.
+            Binary weights and the "position" mode are always imported
+            headless.
+        headless (bool): Apply the weights with :func:`apply_weight_data`
+            instead of the ngSkinTools transfer window. ngSkinTools layers
+            are flattened and not kept, and the import can't be undone.
+
+    Raises:
+        ValueError: If a headless import of JSON data uses a mode needing
+            geometry, see :func:`apply_weight_data`.
 
     """
+    if binary or headless or mode == "position":
+        weight_data = data
+        if weight_data is None and binary:
+            weight_data = import_weight_data(node, path)
+        elif weight_data is None:
+            weight_data = import_layer_data(node, path)
+        if weight_data and not isinstance(
+            weight_data, bgdev.utils.weightfile.WeightData
+        ):
+            weight_data = bgdev.utils.weightfile.from_ngskintools(weight_data)
+        if weight_data:
+            apply_weight_data(node, weight_data, mode=mode)
+        return
+
     modules = check_libraries()
     mode_remap = {"closestPoint": 0, "UV": 1, "vertexID": 2}
 
@@ -232,20 +758,12 @@ def import_skinweights(  # pylint: disable=too-many-locals
     # get influence in weight file
     influences = []
     for each in data.get("influences", {}).values():
-        short = each.get("path", "").rsplit("|")[-1]
-        if cmds.objExists(short):
-            influences.append(short)
+        influences.append(each.get("path", ""))
 
-    if not influences:
+    skc = get_or_create_skincluster(node, influences)
+    if not skc:
         return
 
-    # check if skincluster already exists
-    skc = bgdev.utils.skincluster.get_skincluster(node)
-    if skc:
-        bgdev.utils.skincluster.add_influences(skc, influences)
-    else:
-        skc = bgdev.utils.skincluster.bind_skincluster(node, influences)
-
     # import weights
     remove_layers(node)
     LOG.info("Importing %r weights...", str(node))
@@ -288,6 +806,451 @@ def import_layer_data(node, path):
     return ng_data
 
 
+def import_weight_data(node, path):
+    """Import sparse weights from a binary weight file.
+
+    Args:
+        node (str): Name of the mesh. Used to find the binary file.
+        path (str): The parent folder where the file is saved.
+
+    Returns:
+        WeightData: The sparse weights, memory-mapped from the file.
+    """
+    nice_name = node.rsplit("|")[-1].rsplit(":")[-1]
+    weight_file = os.path.join(
+        path, nice_name + bgdev.utils.weightfile.EXTENSION
+    )
+
+    if not os.path.exists(weight_file):
+        LOG.info("%r not found.", weight_file)
+        return None
+
+    return bgdev.utils.weightfile.load(weight_file)
+
+
+def get_or_create_skincluster(node, influences):
+    """Get the skincluster of given node and make sure it has the influences.
+
+    Influences that don't exist in the scene are ignored.
+    A new skincluster is bound if the node doesn't have one yet.
+
+    Args:
+        node (str): Name of the mesh.
+        influences (list): Names of the required influences.
+
+    Returns:
+        str: The skincluster, or None if none of the influences exist.
+    """
+    influences = [x.rsplit("|")[-1] for x in influences]
+    influences = [x for x in influences if cmds.objExists(x)]
+    if not influences:
+        return None
+
+    skc = bgdev.utils.skincluster.get_skincluster(node)
+    if skc:
+        bgdev.utils.skincluster.add_influences(skc, influences)
+    else:
+        skc = bgdev.utils.skincluster.bind_skincluster(node, influences)
+    return skc
+
+
+def apply_weight_data(node, weight_data, mode="vertexID", uv_set=None):
+    """Apply sparse weights onto given node in a single write.
+
+    This doesn't need ngSkinTools nor any UI, so it works in batch mode.
+    Weights of influences missing from the scene are dropped and the
+    remaining weights renormalized.
+
+    The weights are written with ``MFnSkinCluster.setWeights``, which isn't
+    undoable, so this can't be undone.
+
+    Args:
+        node (str): Name of the skinned node.
+        weight_data (WeightData): The sparse weights to apply.
+        mode (str): Can be "vertexID", "position", "UV" or "closestPoint".
+            All but "vertexID" need the geometry stored with the weights.
+            "position" copies the weights of the source vertex found at the
+            same position, whatever the vertex order, and falls back to
+            "closestPoint" for the unmatched ones. The last two interpolate
+            the weights of the closest source triangle.
+        uv_set (str): Name of the target uv set used in "UV" mode.
+            Use the current one if None.
+
+    Raises:
+        ValueError: If the mode is unknown, or needs geometry which isn't
+            stored with the weights, like the ones read from ngSkinTools
+            JSON data.
+
+    """
+    arrays = weight_data.arrays
+    required = {
+        "position": "triangles",
+        "closestPoint": "triangles",
+        "UV": "uv_triangles",
+    }
+    if mode not in ("vertexID", "position", "closestPoint", "UV"):
+        raise ValueError("Unknown mode: {}".format(mode))
+    if mode in required and required[mode] not in arrays:
+        raise ValueError(
+            "Can't import {!r} weights in {!r} mode: no geometry is stored "
+            "with them.".format(str(node), mode)
+        )
+
+    count = cmds.polyEvaluate(node, vertex=True)
+    if mode == "vertexID":
+        if count != weight_data.vertex_count:
+            LOG.warning(
+                "Can't import weights on %r: %s vertices expected, found %s.",
+                str(node),
+                weight_data.vertex_count,
+                count,
+            )
+            return
+
+        topology = bgdev.utils.mesh.get_topology_hash(node)
+        if weight_data.topology_hash and weight_data.topology_hash != topology:
+            LOG.warning("Topology of %r changed since export.", str(node))
+
+    skc = get_or_create_skincluster(node, weight_data.influences)
+    if not skc:
+        return
+
+    LOG.info("Importing %r weights (%s)...", str(node), mode)
+    influences = bgdev.utils.skincluster.get_influences(skc)
+    influences = [x.rpartition("|")[-1] for x in influences]
+    lookup = {x: i for i, x in enumerate(influences)}
+    columns = [lookup.get(x, -1) for x in weight_data.influences]
+    found = [i for i, x in enumerate(columns) if x >= 0]
+
+    source = weight_data.to_dense()
+    array = np.zeros((weight_data.vertex_count, len(influences)))
+    array[:, [columns[i] for i in found]] = source[:, found]
+
+    if mode == "position":
+        array = transfer_position(
+            array, arrays["points"], arrays["triangles"], node
+        )
+    elif mode == "closestPoint":
+        array = transfer_closest_point(
+            array, arrays["points"], arrays["triangles"], node
+        )
+    elif mode == "UV":
+        array = transfer_uv(
+            array,
+            arrays["uvs"],
+            arrays["uv_triangles"],
+            arrays["triangles"],
+            node,
+            uv_set,
+        )
+
+    array = bgdev.utils.weightarray.normalize(array)
+    bgdev.utils.skincluster.set_weights(skc, array)
+
+
+def transfer_closest_point(array, points, triangles, node):
+    """Transfer per-vertex values onto given node using closest points.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x N)`` source values.
+        points (numpy.ndarray): The world space source rest points.
+        triangles (numpy.ndarray): The ``(triangles x 3)`` source triangles.
+        node (str): Name of the target mesh. Its rest points are used.
+
+    Returns:
+        numpy.ndarray: The ``(target vertices x N)`` interpolated values.
+    """
+    index = bgdev.utils.spatial.TriangleIndex(points, triangles)
+    rest = bgdev.utils.mesh.get_rest_shape(node)
+    return index.transfer(array, bgdev.utils.mesh.get_points(rest))
+
+
+def transfer_position(  # pylint: disable=too-many-arguments
+    array, points, triangles, node, tolerance=POSITION_TOLERANCE
+):
+    """Transfer per-vertex values onto given node by matching positions.
+
+    Target vertices found at the position of a source vertex get its values
+    as is, so reordered or merged meshes keep their exact weights. The other
+    ones are interpolated from the closest source triangle.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x N)`` source values.
+        points (numpy.ndarray): The world space source rest points.
+        triangles (numpy.ndarray): The ``(triangles x 3)`` source triangles.
+        node (str): Name of the target mesh. Its rest points are matched, so
+            the result doesn't depend on the current pose.
+        tolerance (float): Maximum distance between matching vertices.
+            The default one is above the precision of the float32 points
+            stored in weight files.
+
+    Returns:
+        numpy.ndarray: The ``(target vertices x N)`` values.
+    """
+    rest = bgdev.utils.mesh.get_rest_shape(node)
+    targets = bgdev.utils.mesh.get_points(rest)
+    matches = bgdev.utils.spatial.match_points(points, targets, tolerance)
+    matched = matches >= 0
+
+    result = np.empty((len(targets), array.shape[1]), dtype=array.dtype)
+    result[matched] = array[matches[matched]]
+    if not matched.all():
+        index = bgdev.utils.spatial.TriangleIndex(points, triangles)
+        result[~matched] = index.transfer(array, targets[~matched])
+
+    LOG.info(
+        "%r: %s vertices matched by position, %s interpolated.",
+        str(node),
+        matched.sum(),
+        len(matched) - matched.sum(),
+    )
+    return result
+
+
+def transfer_uv(  # pylint: disable=too-many-arguments
+    array, uvs, uv_triangles, triangles, node, uv_set=None
+):
+    """Transfer per-vertex values onto given node using UV space.
+
+    Args:
+        array (numpy.ndarray): The ``(vertices x N)`` source values.
+        uvs (numpy.ndarray): The ``(uvs x 2)`` source coordinates.
+        uv_triangles (numpy.ndarray): The uv ids of each source triangle.
+        triangles (numpy.ndarray): The vertex ids of each source triangle.
+        node (str): Name of the target mesh.
+        uv_set (str): Name of the target uv set. Use the current one if None.
+
+    Returns:
+        numpy.ndarray: The ``(target vertices x N)`` interpolated values.
+    """
+    targets = bgdev.utils.mesh.get_vertex_uvs(node, uv_set)
+    missing = np.isnan(targets[:, 0])
+    if missing.any():
+        LOG.warning("%s vertices without UVs on %r.", missing.sum(), node)
+
+    mapped = np.all(np.asarray(uv_triangles) >= 0, axis=1)
+    index = bgdev.utils.spatial.UVIndex(
+        uvs,
+        np.asarray(uv_triangles)[mapped],
+        np.asarray(triangles)[mapped],
+    )
+    return index.transfer(array, np.nan_to_num(targets))
+
+
+def compare_import_engines(nodes, mode="vertexID"):
+    """Time the ngSkinTools and headless imports on given nodes.
+
+    The weights of each node are exported once, then imported back with
+    both engines.
+
+    Args:
+        nodes (list): The skinned nodes to test on.
+        mode (str): The import mode, see :func:`import_skinweights`.
+
+    Returns:
+        dict: The import time of each engine, in seconds.
+    """
+    data = {x: export_skinweights(x, export=False) for x in nodes}
+    data = {x: y for x, y in data.items() if y}
+
+    timings = {}
+    for engine, headless in (("ngSkinTools", False), ("headless", True)):
+        start = time.time()
+        for node, ng_data in sorted(data.items()):
+            import_skinweights(
+                node, data=ng_data, mode=mode, headless=headless
+            )
+        timings[engine] = time.time() - start
+
+    LOG.info(
+        "Imported %s meshes: ngSkinTools %.2fs, headless %.2fs (x%.1f)",
+        len(data),
+        timings["ngSkinTools"],
+        timings["headless"],
+        timings["ngSkinTools"] / max(timings["headless"], 1e-6),
+    )
+    return timings
+
+
+def export_deformer_weights(nodes, path):
+    """Export the weight maps of every deformer of given meshes in one file.
+
+    Each deformer is stored as a compressed block of a pack file (see
+    :class:`bgdev.utils.weightfile.PackWriter`) named
+    ``deformer[geometry index]``, with one column per weight map and the
+    rest points and triangles of the mesh, so the maps can be imported
+    selectively and remapped by position.
+
+    SkinClusters are skipped, see :func:`export_multiple_skinweights`.
+
+    Args:
+        nodes (list): The deformed meshes.
+        path (str): File path to export the weights.
+
+    Returns:
+        list: The names of the exported blocks.
+    """
+    names = []
+    with bgdev.utils.weightfile.PackWriter(path) as writer:
+        for node in nodes:
+            rest, arrays = bgdev.utils.mesh.get_rest_shape(node), None
+            for deformer, geometry in get_mesh_deformers(node):
+                maps = get_deformer_maps(deformer)
+                array = np.column_stack(
+                    [
+                        bgdev.utils.deformer.DeformerWeights(
+                            deformer, index=x, geometry=geometry
+                        ).get()
+                        for x in maps.values()
+                    ]
+                )
+                if arrays is None:
+                    points = bgdev.utils.mesh.get_points(rest)
+                    arrays = {
+                        "points": points.astype(np.float32),
+                        "triangles": bgdev.utils.mesh.get_triangles(rest),
+                    }
+
+                # deformer weights can be negative, store all of them
+                weight_data = bgdev.utils.weightfile.WeightData.from_dense(
+                    array,
+                    list(maps),
+                    bgdev.utils.mesh.get_topology_hash(node),
+                    threshold=-np.inf,
+                    arrays=arrays,
+                    metadata={
+                        "deformer": deformer,
+                        "type": cmds.nodeType(deformer),
+                        "mesh": node,
+                        "geometry": geometry,
+                    },
+                )
+                name = "{}[{}]".format(deformer, geometry)
+                writer.write(
+                    name, bgdev.utils.weightfile.compress(weight_data)
+                )
+                names.append(name)
+
+    LOG.info("Exported %s deformer weights to %r.", len(names), path)
+    return names
+
+
+def import_deformer_weights(path, deformers=None, mode="vertexID"):
+    """Import the weight maps saved by :func:`export_deformer_weights`.
+
+    All the maps are imported in a single undo chunk.
+
+    Args:
+        path (str): File path of the deformer weights.
+        deformers (list): Only import the maps of these deformers if given.
+        mode (str): Can be "vertexID" or "position". "position" remaps the
+            weights on the rest position of the meshes, for meshes whose
+            vertex order or count changed (see :func:`transfer_position`).
+
+    Raises:
+        ValueError: If the mode isn't supported.
+
+    Returns:
+        list: The names of the imported blocks.
+    """
+    if mode not in ("vertexID", "position"):
+        raise ValueError("Unknown mode: {}".format(mode))
+
+    names = None
+    index = bgdev.utils.weightfile.read_index(path)
+    if deformers is not None and index is not None:
+        names = [x for x in index if x.rpartition("[")[0] in deformers]
+
+    imported = []
+    with bgdev.utils.contexts.undo_chunk("import_deformer_weights"):
+        pack = bgdev.utils.weightfile.iter_pack(path, names)
+        for name, weight_data in pack:
+            deformer = weight_data.metadata["deformer"]
+            geometry = weight_data.metadata["geometry"]
+            if deformers is not None and deformer not in deformers:
+                continue
+            if not cmds.objExists(deformer):
+                LOG.warning("%r not found, skipping its weights.", deformer)
+                continue
+
+            array = weight_data.to_dense()
+            weights = bgdev.utils.deformer.DeformerWeights(
+                deformer, geometry=geometry
+            )
+            if mode == "position":
+                array = transfer_position(
+                    array,
+                    weight_data.arrays["points"],
+                    weight_data.arrays["triangles"],
+                    weights.dag.partialPathName(),
+                )
+            elif weights.count != weight_data.vertex_count:
+                LOG.warning(
+                    "Can't import %r weights: %s vertices expected, found %s.",
+                    deformer,
+                    weight_data.vertex_count,
+                    weights.count,
+                )
+                continue
+
+            maps = get_deformer_maps(deformer)
+            for column, map_name in enumerate(weight_data.influences):
+                if map_name not in maps:
+                    LOG.warning("%r not found on %r.", map_name, deformer)
+                    continue
+                bgdev.utils.deformer.DeformerWeights(
+                    deformer, index=maps[map_name], geometry=geometry
+                ).set(array[:, column])
+            imported.append(name)
+
+    LOG.info("Imported %s deformer weights.", len(imported))
+    return imported
+
+
+def get_mesh_deformers(node):
+    """Get the deformers with weight maps in the history of given mesh.
+
+    Args:
+        node (str): Name of the mesh.
+
+    Returns:
+        list: The name of each deformer and the index of the mesh on it.
+    """
+    shape = bgdev.api.core.as_dag(node, to_shape=True)
+    history = cmds.listHistory(shape.fullPathName(), pruneDagObjects=True)
+    result = []
+    for deformer in cmds.ls(history or [], type="geometryFilter"):
+        node_type = bgdev.utils.deformer.DeformerWeights.get_type(deformer)
+        if node_type in (None, "skinCluster"):
+            continue
+        filter_ = bgdev.api.core.as_filter(deformer)
+        try:
+            geometry = filter_.indexForOutputShape(shape.node())
+        except RuntimeError:  # deforms another mesh up the history
+            continue
+        result.append((deformer, geometry))
+    return result
+
+
+def get_deformer_maps(deformer):
+    """Get the weight maps of given deformer.
+
+    Args:
+        deformer (str): Name of the deformer.
+
+    Returns:
+        OrderedDict: The :class:`bgdev.utils.deformer.DeformerWeights`
+        index of each map, by name. BlendShapes have their base weights
+        then one map per target alias.
+    """
+    if cmds.nodeType(deformer) != "blendShape":
+        return OrderedDict([("weights", None)])
+    maps = OrderedDict([("baseWeights", None)])
+    aliases = bgdev.api.attribute.get_node_aliases(deformer, indices=True)
+    maps.update(aliases or {})
+    return maps
+
+
 def initialize_layers(node):
     """Remove ngSkinTools layers.
 
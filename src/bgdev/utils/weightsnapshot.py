@@ -0,0 +1,330 @@
+"""In-memory snapshots of skin weights.
+
+A snapshot keeps the weights of a skincluster along with its influence
+order, either as a dense float32 array, as sparse CSR arrays or, to halve
+the memory at the cost of precision, as a dense float16 array. Snapshots
+are kept in a bounded history where the least recently used ones are
+dropped first, and can be compared or restored in a single write::
+
+    before = weightsnapshot.capture("body_skinCluster")
+    weightmap.import_skinweights("body")
+    weightsnapshot.show_diff(before)
+    weightsnapshot.restore(before)
+
+:created: 17/10/2026
+:author: Benoit Gielly <benoit.gielly@gmail.com>
+"""
+from __future__ import absolute_import, division
+
+import itertools
+import logging
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import bgdev.api.skincluster
+import bgdev.utils.mesh
+import bgdev.utils.skincluster
+import bgdev.utils.weightarray
+import bgdev.utils.weightfile
+
+LOG = logging.getLogger(__name__)
+
+STORAGES = ("float16", "float32", "sparse")
+DEFAULT_STORAGE = "float32"
+HISTORY_SIZE = 20
+COLOR_SET = "weightDiff"
+COUNTER = itertools.count(1)
+
+
+class Snapshot(object):
+    """Weights of a skincluster at a given time.
+
+    Args:
+        skincluster (str): Name of the skincluster.
+        influences (list): Ordered influence names (the columns).
+        array (numpy.ndarray): The ``(vertices x influences)`` weights.
+        label (str): Name of the snapshot.
+        storage (str): Can be "float32", "sparse" or "float16". Only
+            float16 loses precision, up to 2.5e-4 on the weights.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        skincluster,
+        influences,
+        array,
+        label="",
+        storage=DEFAULT_STORAGE,
+    ):
+        if storage not in STORAGES:
+            raise ValueError("Unknown storage: {}".format(storage))
+        self.skincluster = skincluster
+        self.influences = list(influences)
+        self.vertex_count = len(array)
+        self.label = label
+        self.storage = storage
+        self.time = time.time()
+        if storage == "sparse":
+            self.data = bgdev.utils.weightfile.WeightData.from_dense(
+                array, self.influences
+            )
+        else:
+            self.data = np.asarray(array, dtype=storage)
+
+    def __repr__(self):
+        return "{}({!r}, label={!r}, storage={!r})".format(
+            self.__class__.__name__, self.skincluster, self.label, self.storage
+        )
+
+    @property
+    def nbytes(self):
+        """int: Memory used by the stored weights."""
+        if self.storage == "sparse":
+            return (
+                sum(x.nbytes for x in (self.data.indptr, self.data.indices))
+                + self.data.data.nbytes
+            )
+        return self.data.nbytes
+
+    def to_dense(self, influences=None):
+        """Get the snapshot weights as a dense float64 array.
+
+        Args:
+            influences (list): Ordered influence names of the columns to
+                return. Influences missing from the snapshot are zero.
+                Use the snapshot influences if None.
+
+        Returns:
+            numpy.ndarray: The ``(vertices x influences)`` weight array.
+        """
+        if self.storage == "sparse":
+            array = self.data.to_dense()
+        else:
+            array = self.data.astype(bgdev.utils.weightarray.DTYPE)
+        if influences is None:
+            return array
+
+        lookup = {x: i for i, x in enumerate(self.influences)}
+        result = np.zeros((len(array), len(influences)), dtype=array.dtype)
+        for column, name in enumerate(influences):
+            if name in lookup:
+                result[:, column] = array[:, lookup[name]]
+        return result
+
+
+class SnapshotHistory(object):
+    """Bounded history of snapshots, dropping the least recently used.
+
+    The snapshots are kept in their access order to find the one to drop,
+    and in their capture order to find the latest one.
+
+    Args:
+        size (int): Maximum amount of snapshots to keep.
+
+    """
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self.snapshots = OrderedDict()
+        self.captures = OrderedDict()
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def add(self, snapshot):
+        """Store given snapshot, dropping the least recently used if needed."""
+        key = (snapshot.skincluster, snapshot.label)
+        self.snapshots.pop(key, None)
+        self.captures.pop(key, None)
+        self.snapshots[key] = self.captures[key] = snapshot
+        while len(self.snapshots) > self.size:
+            key, _ = self.snapshots.popitem(last=False)
+            del self.captures[key]
+
+    def get(self, skincluster, label=None):
+        """Get a snapshot of given skincluster.
+
+        Args:
+            skincluster (str): Name of the skincluster.
+            label (str): Name of the snapshot. Get the latest captured one
+                if None.
+
+        Returns:
+            Snapshot: The snapshot if found, None otherwise.
+        """
+        if label is None:
+            keys = [x for x in self.captures if x[0] == skincluster]
+            if not keys:
+                return None
+            key = keys[-1]
+        else:
+            key = (skincluster, label)
+        if key not in self.snapshots:
+            return None
+        snapshot = self.snapshots[key] = self.snapshots.pop(key)
+        return snapshot
+
+    def remove(self, snapshot):
+        """Remove given snapshot from the history, if stored."""
+        key = (snapshot.skincluster, snapshot.label)
+        if self.captures.get(key) is snapshot:
+            del self.snapshots[key]
+            del self.captures[key]
+
+    def list(self, skincluster=None):
+        """List the stored snapshots, in capture order."""
+        return [
+            x
+            for x in self.captures.values()
+            if skincluster is None or x.skincluster == skincluster
+        ]
+
+    def clear(self):
+        """Remove all the stored snapshots."""
+        self.snapshots.clear()
+        self.captures.clear()
+
+
+HISTORY = SnapshotHistory()
+
+
+def capture(node, label=None, storage=DEFAULT_STORAGE, history=HISTORY):
+    """Capture the current weights of given node.
+
+    Args:
+        node (str): Can be either the skincluster or the bound node.
+        label (str): Name of the snapshot. Defaults to an increasing
+            "snapshot<N>" name.
+        storage (str): Can be "float32", "sparse" or "float16".
+            See :class:`Snapshot`.
+        history (SnapshotHistory): Where to store the snapshot, if any.
+
+    Raises:
+        RuntimeError: If the skincluster cannot be found.
+
+    Returns:
+        Snapshot: The new snapshot.
+    """
+    skc = bgdev.utils.skincluster.get_skincluster(node)
+    if not skc:
+        raise RuntimeError("Couldn't find a skincluster.")
+
+    snapshot = Snapshot(
+        skc,
+        bgdev.api.skincluster.get_influences(skc),
+        bgdev.utils.skincluster.get_weights(skc),
+        label=label or "snapshot{}".format(next(COUNTER)),
+        storage=storage,
+    )
+    if history is not None:
+        history.add(snapshot)
+    LOG.debug("Captured %r (%s bytes).", snapshot, snapshot.nbytes)
+    return snapshot
+
+
+def restore(snapshot):
+    """Write the weights of given snapshot back in a single write.
+
+    Influences removed from the skincluster since the capture are dropped
+    and the remaining weights renormalized.
+
+    Args:
+        snapshot (Snapshot): The snapshot to restore.
+    """
+    skc = snapshot.skincluster
+    influences = bgdev.api.skincluster.get_influences(skc)
+    missing = set(snapshot.influences) - set(influences)
+    if missing:
+        LOG.warning("Influences not found on %s: %s", skc, sorted(missing))
+    array = bgdev.utils.weightarray.normalize(snapshot.to_dense(influences))
+    bgdev.utils.skincluster.set_weights(skc, array)
+
+
+def diff(first, second=None, tolerance=1e-3):
+    """Compare the weights of two snapshots.
+
+    Args:
+        first (Snapshot): The reference snapshot.
+        second (Snapshot): The snapshot to compare. Use the current weights
+            of the first snapshot's skincluster if None.
+        tolerance (float): Ignore weight changes below this value. The
+            default one is above the precision of float16 snapshots.
+
+    Raises:
+        ValueError: If the snapshots don't have the same amount of vertices.
+
+    Returns:
+        dict: The "vertices" which changed, the max "delta" of each vertex
+        and the "influences" max delta, by name.
+    """
+    if second is None:
+        second = capture(first.skincluster, history=None)
+    if first.vertex_count != second.vertex_count:
+        raise ValueError(
+            "Can't compare {} and {} vertices.".format(
+                first.vertex_count, second.vertex_count
+            )
+        )
+
+    influences = first.influences + [
+        x for x in second.influences if x not in first.influences
+    ]
+    delta = np.abs(second.to_dense(influences) - first.to_dense(influences))
+    per_vertex = delta.max(axis=1) if influences else np.zeros(len(delta))
+    per_influence = delta.max(axis=0) if len(delta) else np.zeros(0)
+    return {
+        "vertices": np.flatnonzero(per_vertex > tolerance),
+        "delta": per_vertex,
+        "influences": OrderedDict(
+            (x, float(y))
+            for x, y in zip(influences, per_influence)
+            if y > tolerance
+        ),
+    }
+
+
+def get_heatmap(values):
+    """Map values to a blue, green, red colour ramp.
+
+    Args:
+        values (numpy.ndarray): The ``(N,)`` values, normalized on their max.
+
+    Returns:
+        numpy.ndarray: The ``(N x 3)`` RGB colours.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    peak = values.max() if len(values) else 0.0
+    values = values / peak if peak > 0 else np.zeros_like(values)
+    colors = np.zeros((len(values), 3))
+    colors[:, 0] = np.clip(values * 2.0 - 1.0, 0.0, 1.0)
+    colors[:, 1] = 1.0 - np.abs(values * 2.0 - 1.0)
+    colors[:, 2] = np.clip(1.0 - values * 2.0, 0.0, 1.0)
+    return colors
+
+
+def show_diff(first, second=None, color_set=COLOR_SET):
+    """Display the difference between two snapshots as vertex colours.
+
+    Args:
+        first (Snapshot): The reference snapshot.
+        second (Snapshot): The snapshot to compare. Use the current weights
+            of the first snapshot's skincluster if None.
+        color_set (str): Name of the colour set to create or update.
+
+    Returns:
+        dict: The result of :func:`diff`.
+    """
+    result = diff(first, second)
+    mesh = bgdev.api.skincluster.get_geometry(first.skincluster)
+    bgdev.utils.mesh.set_vertex_colors(
+        mesh.partialPathName(), get_heatmap(result["delta"]), color_set
+    )
+    LOG.info(
+        "%s vertices changed on %s.",
+        len(result["vertices"]),
+        first.skincluster,
+    )
+    return result
@@ -0,0 +1,17 @@
+"""Pytest configuration.
+
+Only the modules which don't need Maya are tested here. The ``bgdev``
+package imports ``maya.OpenMaya`` for its log handler, so a placeholder
+module is registered when the tests don't run inside mayapy.
+"""
+import sys
+import types
+from unittest import mock
+
+try:
+    import maya.OpenMaya  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    MAYA = types.ModuleType("maya")
+    MAYA.OpenMaya = mock.MagicMock()
+    sys.modules["maya"] = MAYA
+    sys.modules["maya.OpenMaya"] = MAYA.OpenMaya
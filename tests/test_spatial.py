@@ -0,0 +1,93 @@
+"""Tests for :mod:`bgdev.utils.spatial`."""
+import numpy as np
+import pytest
+
+from bgdev.utils import spatial
+
+
+@pytest.fixture(name="grid")
+def fixture_grid():
+    """Get a bumpy ``(points, triangles)`` grid of 12x12 quads."""
+    rng = np.random.default_rng(0)
+    size = 13
+    x_values, z_values = np.meshgrid(np.arange(size), np.arange(size))
+    points = np.column_stack(
+        [x_values.ravel(), rng.random(size * size), z_values.ravel()]
+    ).astype(np.float64)
+    quads = np.arange(size * size).reshape(size, size)[:-1, :-1].ravel()
+    triangles = np.concatenate(
+        [
+            np.column_stack([quads, quads + 1, quads + size]),
+            np.column_stack([quads + 1, quads + size + 1, quads + size]),
+        ]
+    )
+    return points, triangles
+
+
+def brute_force(points, corners):
+    """Get the closest distance of each point over all the triangles."""
+    queries = np.repeat(points, len(corners), axis=0)
+    tiled = np.tile(corners, (len(points), 1, 1))
+    _, distances = spatial.closest_point_on_triangles(queries, tiled)
+    return distances.reshape(len(points), len(corners)).min(axis=1)
+
+
+def test_closest_matches_brute_force(grid):
+    points, triangles = grid
+    rng = np.random.default_rng(1)
+    near = rng.uniform([-1, -1, -1], [13, 2, 13], (300, 3))
+    far = rng.uniform(-100, 100, (20, 3))
+    queries = np.concatenate([near, far])
+
+    index = spatial.TriangleIndex(points, triangles)
+    faces, coords, distances = index.closest(queries)
+    expected = brute_force(queries, points[triangles])
+    assert np.allclose(distances, expected)
+
+    # the coordinates must land on the returned triangles
+    closest = np.einsum("ij,ijk->ik", coords, points[triangles[faces]])
+    delta = queries - closest
+    assert np.allclose(np.einsum("ij,ij->i", delta, delta), expected)
+    assert np.allclose(coords.sum(axis=1), 1.0)
+
+
+def test_transfer_on_vertices_is_exact(grid):
+    points, triangles = grid
+    values = np.random.default_rng(2).random((len(points), 4))
+    index = spatial.TriangleIndex(points, triangles)
+    assert np.allclose(index.transfer(values, points), values)
+
+
+def test_uv_index_matches_brute_force(grid):
+    points, triangles = grid
+    uvs = points[:, [0, 2]] / 12.0
+    rng = np.random.default_rng(3)
+    queries = np.concatenate(
+        [rng.random((200, 2)), rng.uniform(-0.5, 1.5, (50, 2))]
+    )
+
+    index = spatial.UVIndex(uvs, triangles, triangles)
+    faces, coords, distances = index.closest(queries)
+    expected = brute_force(
+        spatial.to_3d(queries), spatial.to_3d(uvs)[triangles]
+    )
+    assert np.allclose(distances, expected)
+
+    inside = np.all((queries >= 0) & (queries <= 1), axis=1)
+    assert np.all(distances[inside] == 0.0)
+    blended = np.einsum(
+        "ij,ijk->ik", coords[inside], uvs[triangles[faces]][inside]
+    )
+    assert np.allclose(blended, queries[inside])
+
+
+def test_match_points(grid):
+    points = grid[0]
+    rng = np.random.default_rng(4)
+    order = rng.permutation(len(points))
+    targets = points[order] + rng.uniform(-1e-4, 1e-4, (len(points), 3))
+    targets[:5] += 10.0
+
+    matches = spatial.match_points(points, targets, tolerance=1e-3)
+    assert np.all(matches[:5] == -1)
+    assert np.array_equal(matches[5:], order[5:])
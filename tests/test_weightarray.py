@@ -0,0 +1,72 @@
+"""Tests for :mod:`bgdev.utils.weightarray`."""
+import numpy as np
+import pytest
+
+from bgdev.utils import weightarray
+
+
+def test_flat_round_trip():
+    array = np.random.default_rng(0).random((5, 3))
+    flat = weightarray.to_flat(array)
+    assert np.array_equal(weightarray.from_flat(flat, 3), array)
+
+
+def test_normalize():
+    array = np.array([[1.0, 1.0, 2.0], [0.0, 0.0, 0.0], [0.0, 0.5, 0.0]])
+    result = weightarray.normalize(array)
+    assert np.allclose(result[0], [0.25, 0.25, 0.5])
+    assert np.array_equal(result[1], [0.0, 0.0, 0.0])
+    assert np.allclose(result[2], [0.0, 1.0, 0.0])
+    assert array[0, 2] == 2.0, "the input must not be modified"
+
+
+def test_normalize_locked():
+    array = np.array([[0.3, 0.1, 0.1]])
+    result = weightarray.normalize(array, locked=[0])
+    assert np.allclose(result, [[0.3, 0.35, 0.35]])
+
+
+def test_prune_max_influences():
+    array = np.array([[0.4, 0.3, 0.2, 0.1], [0.1, 0.2, 0.3, 0.4]])
+    result = weightarray.prune(array, max_influences=2)
+    assert np.allclose(result[0], [4 / 7, 3 / 7, 0.0, 0.0])
+    assert np.allclose(result[1], [0.0, 0.0, 3 / 7, 4 / 7])
+
+
+def test_prune_threshold():
+    array = np.array([[0.95, 0.04, 0.01]])
+    result = weightarray.prune(array, threshold=0.02)
+    assert result[0, 2] == 0.0
+    assert np.isclose(result.sum(), 1.0)
+
+
+def test_prune_keeps_locked():
+    array = np.array([[0.05, 0.5, 0.3, 0.15]])
+    result = weightarray.prune(array, max_influences=2, locked=[0])
+    assert result[0, 0] == 0.05
+    assert np.allclose(result[0], [0.05, 0.95, 0.0, 0.0])
+
+
+def test_mirror():
+    array = np.array([[1.0, 0.0], [0.0, 0.0], [0.5, 0.5]])
+    table = {0: 1, 1: 0, 2: 2, "left": {0}, "right": {1}, "center": {2}}
+    vertex_map, sides = weightarray.get_symmetry_map(table, 3)
+    assert np.array_equal(vertex_map, [1, 0, 2])
+
+    result = weightarray.mirror(array, vertex_map, [1, 0], sides["right"])
+    assert np.array_equal(result[1], [0.0, 1.0])
+    assert np.array_equal(result[0], array[0])
+
+
+def test_mirror_center():
+    array = np.array([[0.8, 0.2]])
+    result = weightarray.mirror(
+        array, [0], [1, 0], np.array([], int), center=np.array([0])
+    )
+    assert np.allclose(result, [[0.5, 0.5]])
+
+
+@pytest.mark.parametrize("shape", [(3,), (2, 2, 2)])
+def test_check_shape_rejects_bad_arrays(shape):
+    with pytest.raises(ValueError):
+        weightarray.check_shape(np.zeros(shape), columns=2)
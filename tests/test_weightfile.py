@@ -0,0 +1,163 @@
+"""Tests for :mod:`bgdev.utils.weightfile`."""
+import numpy as np
+import pytest
+
+from bgdev.utils import weightarray, weightfile
+
+
+@pytest.fixture(name="weights")
+def fixture_weights():
+    """Get random sparse weights with 3 influences per vertex."""
+    rng = np.random.default_rng(0)
+    array = np.zeros((200, 12))
+    for row in array:
+        row[rng.choice(12, 3, replace=False)] = rng.random(3)
+    return weightarray.normalize(array)
+
+
+def get_weight_data(array):
+    """Create weight data with extra arrays and metadata."""
+    return weightfile.WeightData.from_dense(
+        array,
+        ["joint{}".format(x) for x in range(array.shape[1])],
+        "topology",
+        arrays={"points": np.arange(9, dtype=np.float32).reshape(3, 3)},
+        metadata={"mesh": "body"},
+    )
+
+
+def test_from_dense_is_sparse(weights):
+    data = weightfile.WeightData.from_dense(weights, list("abcdefghijkl"))
+    assert len(data.data) == np.count_nonzero(weights)
+    assert np.allclose(data.to_dense(), weights, atol=1e-7)
+    assert np.allclose(data.to_dense([5, 2]), weights[[5, 2]], atol=1e-7)
+
+
+def test_encode_decode_round_trip(weights):
+    data = get_weight_data(weights)
+    result = weightfile.decode(weightfile.encode(data))
+    assert result.influences == data.influences
+    assert result.topology_hash == "topology"
+    assert result.metadata == {"mesh": "body"}
+    assert np.array_equal(result.arrays["points"], data.arrays["points"])
+    assert np.array_equal(result.to_dense(), data.to_dense())
+
+
+def test_save_load_round_trip(weights, tmp_path):
+    data = get_weight_data(weights)
+    path = str(tmp_path / ("body" + weightfile.EXTENSION))
+    weightfile.save(path, data)
+    for mmap in (True, False):
+        result = weightfile.load(path, mmap=mmap)
+        assert np.array_equal(result.to_dense(), data.to_dense())
+
+
+def test_decode_rejects_other_files():
+    with pytest.raises(ValueError):
+        weightfile.decode(b"not a weight file" * 4)
+
+
+def test_pack_round_trip(weights, tmp_path):
+    path = str(tmp_path / "weights.pack")
+    meshes = {"body": weights, "head": weights[::-1]}
+    with weightfile.PackWriter(path) as writer:
+        for name, array in sorted(meshes.items()):
+            writer.write(name, weightfile.compress(get_weight_data(array)))
+
+    assert weightfile.is_pack(path)
+    assert list(weightfile.read_index(path)) == ["body", "head"]
+    result = dict(weightfile.iter_pack(path))
+    for name, array in meshes.items():
+        assert np.allclose(result[name].to_dense(), array, atol=1e-7)
+    assert [x for x, _ in weightfile.iter_pack(path, ["head"])] == ["head"]
+
+
+def test_pack_without_table_of_contents(weights, tmp_path):
+    path = str(tmp_path / "weights.pack")
+    writer = weightfile.PackWriter(path)
+    writer.open()
+    writer.write("body", weightfile.compress(get_weight_data(weights)))
+    writer.write("head", weightfile.compress(get_weight_data(weights)))
+    writer.stream.close()  # simulate an interrupted export
+
+    assert weightfile.read_index(path) is None
+    assert [x for x, _ in weightfile.iter_pack(path, ["head"])] == ["head"]
+
+
+def get_ng_data(layers):
+    """Create ngSkinTools data of 3 vertices with given layers."""
+    return {
+        "influences": {
+            "0": {"index": 0, "path": "|root|A"},
+            "1": {"index": 1, "path": "|root|B"},
+        },
+        "layers": layers,
+    }
+
+
+def test_from_ngskintools_full_layers():
+    layers = [
+        {"opacity": 1.0, "influences": [{"index": 1, "weights": [1] * 3}]},
+        {"opacity": 1.0, "influences": [{"index": 0, "weights": [1] * 3}]},
+    ]
+    data = weightfile.from_ngskintools(get_ng_data(layers))
+    assert data.influences == ["B", "A"]
+    assert np.allclose(data.to_dense(), [[1, 0]] * 3)
+
+
+def test_from_ngskintools_partial_layer():
+    layers = [
+        {"opacity": 1.0, "influences": [{"index": 1, "weights": [1, 0, 0]}]},
+        {"opacity": 1.0, "influences": [{"index": 0, "weights": [1] * 3}]},
+    ]
+    data = weightfile.from_ngskintools(get_ng_data(layers))
+    result = data.to_dense()[:, [data.influences.index(x) for x in "AB"]]
+    assert np.allclose(result, [[0, 1], [1, 0], [1, 0]])
+
+
+def test_from_ngskintools_opacity_and_mask():
+    layers = [
+        {
+            "opacity": 0.5,
+            "mask": [1.0, 0.0, 1.0],
+            "influences": [{"index": 1, "weights": [1, 1, 0.5]}],
+        },
+        {"opacity": 1.0, "influences": [{"index": 0, "weights": [1] * 3}]},
+    ]
+    data = weightfile.from_ngskintools(get_ng_data(layers))
+    result = data.to_dense()[:, [data.influences.index(x) for x in "AB"]]
+    assert np.allclose(result, [[0.5, 0.5], [1, 0], [0.75, 0.25]])
+
+
+@pytest.mark.parametrize("bits", [16, 8])
+def test_quantize_error_within_default_limit(weights, bits):
+    data = get_weight_data(weights)
+    result = weightfile.quantize(data, bits)
+    restored = weightarray.normalize(result.to_dense())
+    error = np.abs(restored - weights).max()
+    assert error <= weightfile.MAX_ERRORS[bits]
+    assert np.isclose(result.metadata["quantization_error"], error, atol=1e-6)
+
+    decoded = weightfile.decode(weightfile.encode(result))
+    assert np.array_equal(decoded.to_dense(), result.to_dense())
+
+
+def test_quantize_8_bits_rejects_strict_limit(weights):
+    with pytest.raises(ValueError):
+        weightfile.quantize(get_weight_data(weights), 8, max_error=1e-3)
+
+
+def test_quantize_unsupported_bits(weights):
+    with pytest.raises(ValueError):
+        weightfile.quantize(get_weight_data(weights), 12)
+
+
+def test_fingerprint_covers_arrays(weights):
+    data = get_weight_data(weights)
+    fingerprint = weightfile.get_fingerprint(data)
+    assert fingerprint == weightfile.get_fingerprint(get_weight_data(weights))
+
+    data.arrays["points"] = data.arrays["points"] + 1.0
+    moved = weightfile.get_fingerprint(data)
+    assert moved["weights"] == fingerprint["weights"]
+    assert moved["arrays"] != fingerprint["arrays"]